@@ -0,0 +1,448 @@
+"""Cache-affinity dispatcher in front of several API instances.
+
+Uploads are hashed while they stream in and routed by consistent hashing on
+the file SHA-256, so re-uploads of a contract always reach the node whose
+page cache, revision store and audit trail already know it. Requests with a
+hash in the path (``/audit/{sha256}``, ``/admin/profiles/{sha256}``) follow the
+same ring, and ``/extract/revision`` is routed on its ``previous_sha256`` field
+so it reaches the node holding the earlier version; the new version's hash is
+then pinned to that node in memory (``placements``) so its audit records and
+later revisions are found. Unhealthy nodes are ejected from routing and
+rejoin once ``/health`` answers again; only the keys they owned move. Membership starts from ``DISPATCHER_BACKENDS`` and can be
+changed at runtime with ``POST``/``DELETE /dispatcher/backends`` (JSON body
+``{"url": ...}``), which likewise moves only the joining or leaving node's keys.
+
+A request is retried on the next node only when the connection could not be
+opened, i.e. the backend never saw it; a timeout or broken response after
+delivery is returned as 504/502 so a slow extraction is not run twice.
+
+Run it in front of local backends with::
+
+    uvicorn app.main:app --port 8001 &
+    uvicorn app.main:app --port 8002 &
+    uvicorn app.dispatcher:app --port 8000
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+from core import config
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+_UPLOAD_FIELD = b"file"
+_ROUTING_FIELDS = {b"previous_sha256"}
+_ROUTING_FIELD_MAX_BYTES = 128
+# Revisions are stored on the node that extracted the earlier version.
+_ROUTE_BY_FIELD = {"/extract/revision": b"previous_sha256"}
+_MAX_PLACEMENTS = 100_000
+_HASH_IN_PATH = re.compile(r"/([0-9a-f]{64})(?:/|$)")
+_SHA256 = re.compile(r"[0-9a-f]{64}")
+_HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+}
+
+
+def _ring_point(value: str) -> int:
+    return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring with ``vnodes`` virtual points per backend."""
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = config.DISPATCHER_VIRTUAL_NODES) -> None:
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self.nodes: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for index in range(self.vnodes):
+            point = _ring_point(f"{node}#{index}")
+            position = bisect.bisect(self._points, point)
+            self._points.insert(position, point)
+            self._owners.insert(position, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def candidates(self, key: str) -> List[str]:
+        """Distinct nodes in ring order starting at ``key``'s position."""
+        if not self._points:
+            return []
+        start = bisect.bisect(self._points, _ring_point(key)) % len(self._points)
+        ordered: List[str] = []
+        for offset in range(len(self._points)):
+            owner = self._owners[(start + offset) % len(self._points)]
+            if owner not in ordered:
+                ordered.append(owner)
+                if len(ordered) == len(self.nodes):
+                    break
+        return ordered
+
+    def node_for(self, key: str, healthy: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        for node in self.candidates(key):
+            if healthy is None or healthy(node):
+                return node
+        return None
+
+
+class UploadHasher:
+    """Hash the ``file`` part of a multipart body as chunks arrive.
+
+    Small routing fields (``previous_sha256``) are captured along the way.
+    """
+
+    def __init__(self, content_type: bytes) -> None:
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        self._digest = hashlib.sha256()
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._in_file = False
+        self._field: Optional[bytes] = None
+        self.fields: Dict[bytes, bytes] = {}
+        self.found = False
+        self._parser = (
+            MultipartParser(
+                boundary,
+                {
+                    "on_part_begin": self._on_part_begin,
+                    "on_header_field": self._on_header_field,
+                    "on_header_value": self._on_header_value,
+                    "on_header_end": self._on_header_end,
+                    "on_headers_finished": self._on_headers_finished,
+                    "on_part_data": self._on_part_data,
+                    "on_part_end": self._on_part_end,
+                },
+            )
+            if boundary
+            else None
+        )
+
+    def _on_part_begin(self) -> None:
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._disposition)
+        name = params.get(b"name")
+        self._in_file = not self.found and name == _UPLOAD_FIELD
+        self.found = self.found or self._in_file
+        self._field = name if name in _ROUTING_FIELDS else None
+        if self._field is not None:
+            self.fields[self._field] = b""
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._digest.update(data[start:end])
+        elif self._field is not None and len(self.fields[self._field]) <= _ROUTING_FIELD_MAX_BYTES:
+            self.fields[self._field] += data[start:end]
+
+    def _on_part_end(self) -> None:
+        self._in_file = False
+        self._field = None
+
+    def feed(self, chunk: bytes) -> None:
+        if self._parser is not None and chunk:
+            self._parser.write(chunk)
+
+    def hexdigest(self) -> Optional[str]:
+        return self._digest.hexdigest() if self.found else None
+
+
+class Dispatcher:
+    """ASGI app that forwards each request to the backend owning its hash."""
+
+    def __init__(
+        self,
+        backends: Sequence[str],
+        vnodes: int = config.DISPATCHER_VIRTUAL_NODES,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.ring = HashRing(backends, vnodes)
+        self.failures: Dict[str, int] = {node: 0 for node in backends}
+        self.ejected: set[str] = set()
+        self.routed: Dict[str, int] = {node: 0 for node in backends}
+        self.placements: "OrderedDict[str, str]" = OrderedDict()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._health_task: Optional[asyncio.Task] = None
+
+    # Membership -----------------------------------------------------------
+
+    def add_backend(self, node: str) -> None:
+        self.ring.add(node)
+        self.failures.setdefault(node, 0)
+        self.routed.setdefault(node, 0)
+
+    def remove_backend(self, node: str) -> None:
+        self.ring.remove(node)
+        self.ejected.discard(node)
+
+    def _place(self, key: str, node: str) -> None:
+        self.placements[key] = node
+        self.placements.move_to_end(key)
+        while len(self.placements) > _MAX_PLACEMENTS:
+            self.placements.popitem(last=False)
+
+    def _candidates(self, key: str) -> List[str]:
+        # A revision stored off-ring (on its predecessor's node) is looked up there first.
+        ordered = self.ring.candidates(key)
+        placed = self.placements.get(key)
+        if placed in ordered:
+            ordered.remove(placed)
+            ordered.insert(0, placed)
+        return ordered
+
+    def is_healthy(self, node: str) -> bool:
+        return node not in self.ejected
+
+    def _mark_failure(self, node: str) -> None:
+        self.failures[node] = self.failures.get(node, 0) + 1
+        if self.failures[node] >= config.DISPATCHER_EJECT_AFTER_FAILURES:
+            self.ejected.add(node)
+
+    def _mark_success(self, node: str) -> None:
+        self.failures[node] = 0
+        self.ejected.discard(node)
+
+    async def check_health(self) -> None:
+        """Probe every backend's ``/health`` once, ejecting or rejoining nodes."""
+        client = self._get_client()
+
+        async def probe(node: str) -> None:
+            try:
+                response = await client.get(
+                    f"{node}/health", timeout=config.DISPATCHER_HEALTH_TIMEOUT_SECONDS
+                )
+                healthy = response.status_code == 200
+            except httpx.HTTPError:
+                healthy = False
+            if healthy:
+                self._mark_success(node)
+            else:
+                self._mark_failure(node)
+
+        await asyncio.gather(*(probe(node) for node in list(self.ring.nodes)))
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(config.DISPATCHER_HEALTH_INTERVAL_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backends": [
+                {
+                    "url": node,
+                    "healthy": self.is_healthy(node),
+                    "consecutive_failures": self.failures.get(node, 0),
+                    "routed": self.routed.get(node, 0),
+                }
+                for node in self.ring.nodes
+            ]
+        }
+
+    # ASGI -----------------------------------------------------------------
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=httpx.Timeout(config.DISPATCHER_REQUEST_TIMEOUT_SECONDS),
+            )
+        return self._client
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._handle(scope, receive, send)
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._health_task = asyncio.create_task(self._health_loop())
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._health_task is not None:
+                    self._health_task.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await self._health_task
+                if self._client is not None:
+                    await self._client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(
+        self, scope: Dict[str, Any], receive: Callable
+    ) -> Tuple[bytes, Optional[str], Optional[str]]:
+        """Buffer the body; return it with its routing key and the upload's hash."""
+        headers = dict(scope["headers"])
+        content_type = headers.get(b"content-type", b"")
+        hasher = UploadHasher(content_type) if content_type.startswith(b"multipart/form-data") else None
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            if hasher is not None:
+                hasher.feed(chunk)
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        if hasher is None:
+            return body, None, None
+        upload_hash = hasher.hexdigest()
+        routing_field = _ROUTE_BY_FIELD.get(scope["path"])
+        if routing_field is not None:
+            value = hasher.fields.get(routing_field, b"").decode("latin-1").strip().lower()
+            if _SHA256.fullmatch(value):
+                return body, value, upload_hash
+        return body, upload_hash, upload_hash
+
+    async def _respond_json(self, send: Callable, status_code: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _change_membership(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        body, _, _ = await self._read_body(scope, receive)
+        try:
+            node = str(json.loads(body or b"{}")["url"]).rstrip("/")
+        except (ValueError, KeyError, TypeError):
+            await self._respond_json(send, 400, {"detail": 'Expected a JSON body {"url": ...}.'})
+            return
+        if scope["method"] == "POST":
+            self.add_backend(node)
+        elif scope["method"] == "DELETE":
+            self.remove_backend(node)
+        else:
+            await self._respond_json(send, 405, {"detail": "Use POST or DELETE."})
+            return
+        await self._respond_json(send, 200, self.stats())
+
+    async def _handle(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        path = scope["path"]
+        if path == "/dispatcher/health":
+            await self._respond_json(send, 200, {"status": "ok"})
+            return
+        if path == "/dispatcher/stats":
+            await self._respond_json(send, 200, self.stats())
+            return
+        if path == "/dispatcher/backends":
+            await self._change_membership(scope, receive, send)
+            return
+
+        body, body_key, upload_hash = await self._read_body(scope, receive)
+        in_path = _HASH_IN_PATH.search(path)
+        key = body_key or (in_path.group(1) if in_path else path)
+        candidates = [node for node in self._candidates(key) if self.is_healthy(node)]
+        if not candidates:
+            await self._respond_json(send, 503, {"detail": "No healthy backend available."})
+            return
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in scope["headers"]
+            if name.decode("latin-1").lower() not in _HOP_BY_HOP and name.lower() != b"content-length"
+        ]
+        client = self._get_client()
+        for node in candidates:
+            url = f"{node}{path}" + (f"?{query}" if query else "")
+            request = client.build_request(scope["method"], url, headers=headers, content=body)
+            try:
+                response = await client.send(request, stream=True)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Never delivered; the body is buffered, so the next node on the ring can take it.
+                self._mark_failure(node)
+                continue
+            except httpx.TimeoutException:
+                # The backend may still be extracting; retrying would run the job twice.
+                self._mark_failure(node)
+                await self._respond_json(send, 504, {"detail": "Backend timed out."})
+                return
+            except httpx.TransportError:
+                self._mark_failure(node)
+                await self._respond_json(send, 502, {"detail": "Backend connection failed."})
+                return
+            self.routed[node] = self.routed.get(node, 0) + 1
+            if upload_hash is not None and upload_hash != key:
+                self._place(upload_hash, node)
+            try:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": response.status_code,
+                        "headers": [
+                            (name.encode("latin-1"), value.encode("latin-1"))
+                            for name, value in response.headers.multi_items()
+                            if name.lower() not in _HOP_BY_HOP
+                        ]
+                        + [(b"x-dispatched-to", node.encode("latin-1"))],
+                    }
+                )
+                async for chunk in response.aiter_raw():
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+            finally:
+                await response.aclose()
+            return
+        await self._respond_json(send, 502, {"detail": "All candidate backends failed."})
+
+
+app = Dispatcher(config.DISPATCHER_BACKENDS)
+
+
+__all__ = ["Dispatcher", "HashRing", "UploadHasher", "app"]
@@ -1,28 +1,66 @@
 """FastAPI entrypoint for the legal MVP service."""
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
-from app.routers import extract
-from core import model
+from app.routers import admin, audit, extract
+from core import config, model
+from core import logging as audit_logging
+from services import page_cache, profiling, revisions, workers
 
 
 templates = Jinja2Templates(directory="app/templates")
 
 
+async def _compact_audit_periodically() -> None:
+    while True:
+        await asyncio.to_thread(audit_logging.compact)
+        await asyncio.sleep(config.AUDIT_COMPACTION_INTERVAL_SECONDS)
+
+
+async def _purge_revisions_periodically() -> None:
+    while True:
+        await asyncio.to_thread(revisions.purge)
+        await asyncio.sleep(config.REVISION_PURGE_INTERVAL_SECONDS)
+
+
+async def _purge_profiles_periodically() -> None:
+    while True:
+        await asyncio.to_thread(profiling.purge)
+        await asyncio.sleep(config.PROFILE_PURGE_INTERVAL_SECONDS)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    model.get_qa()
-    model.get_ner()
+    if config.EXTRACTION_MODE == "process":
+        workers.start_pool()
+    else:
+        model.warm()
+    housekeeping = [
+        asyncio.create_task(_purge_revisions_periodically()),
+        asyncio.create_task(_purge_profiles_periodically()),
+    ]
+    if config.AUDIT_BACKEND == "sqlite":
+        housekeeping.append(asyncio.create_task(_compact_audit_periodically()))
     yield
+    for task in housekeeping:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    workers.stop_pool()
+    page_cache.reset()
+    audit_logging.reset_store()
 
 
 app = FastAPI(title="legal-mvp", version="0.1.0", lifespan=lifespan)
 app.include_router(extract.router)
+app.include_router(admin.router)
+app.include_router(audit.router)
 
 
 @app.get("/health")
@@ -30,6 +68,15 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/stats")
+async def stats() -> dict[str, object]:
+    """Report cache, model pool and worker stats for capacity planning."""
+    payload: dict[str, object] = {"page_cache": page_cache.stats(), "model_pool": model.pool_stats()}
+    if config.EXTRACTION_MODE == "process":
+        payload["workers"] = workers.get_pool().stats()
+    return payload
+
+
 @app.get("/", response_class=HTMLResponse)
 async def demo_page(request: Request) -> HTMLResponse:
     """Render the management-friendly demo dashboard."""
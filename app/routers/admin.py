@@ -0,0 +1,74 @@
+"""Admin endpoints for downloading request profiles.
+
+These routes have no authentication of their own and are only gated by
+``PROFILING_ENABLED``; keep ``/admin`` off public networks.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from core import config
+from services import profiling
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _require_profiling() -> None:
+    if not config.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled.")
+
+
+def _require_file(path: Optional[Path]) -> Path:
+    if path is None or not path.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found.")
+    return path
+
+
+def _download(path: Optional[Path]) -> FileResponse:
+    path = _require_file(path)
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+
+def _load_spans(path: Optional[Path]) -> dict:
+    with _require_file(path).open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+@router.get("/profiles/{file_hash}")
+async def download_profile(file_hash: str) -> FileResponse:
+    """Download the latest cProfile stats captured for ``file_hash`` (load with ``pstats``)."""
+    _require_profiling()
+    return _download(profiling.profile_path(file_hash))
+
+
+@router.get("/profiles/{file_hash}/spans")
+async def profile_spans(file_hash: str) -> dict:
+    """Return the span annotations (stage, page, question, timings) of the latest run."""
+    _require_profiling()
+    return _load_spans(profiling.spans_path(file_hash))
+
+
+@router.get("/profiles/{file_hash}/runs")
+async def profile_runs(file_hash: str) -> dict:
+    """List the stored profile runs for ``file_hash``, oldest first."""
+    _require_profiling()
+    return {"file_sha256": file_hash, "runs": profiling.runs(file_hash)}
+
+
+@router.get("/profiles/{file_hash}/{run_id}")
+async def download_profile_run(file_hash: str, run_id: str) -> FileResponse:
+    """Download the cProfile stats of one profiled request."""
+    _require_profiling()
+    return _download(profiling.profile_path(file_hash, run_id))
+
+
+@router.get("/profiles/{file_hash}/{run_id}/spans")
+async def profile_run_spans(file_hash: str, run_id: str) -> dict:
+    """Return the span annotations of one profiled request."""
+    _require_profiling()
+    return _load_spans(profiling.spans_path(file_hash, run_id))
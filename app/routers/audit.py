@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from core import config
+from core import logging as audit_logging
+from core import utils
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+_MAX_LIMIT = 1000
+
+
+def _normalize_timestamp(value: Optional[str], name: str) -> Optional[str]:
+    """Parse an ISO-8601 bound and render it the way audit timestamps are stored."""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid ISO-8601 timestamp for {name}."
+        ) from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=config.DEFAULT_TIMEZONE)
+    return parsed.astimezone(config.DEFAULT_TIMEZONE).isoformat()
+
+
+@router.get("")
+async def audit_range(
+    start: Optional[str] = Query(None, description="inclusive ISO-8601 lower bound"),
+    end: Optional[str] = Query(None, description="exclusive ISO-8601 upper bound"),
+    limit: int = Query(100, ge=1, le=_MAX_LIMIT),
+) -> dict:
+    """Return audit records processed within ``[start, end)``, oldest first."""
+    lower = _normalize_timestamp(start, "start")
+    upper = _normalize_timestamp(end, "end")
+    records = await run_in_threadpool(audit_logging.query_range, lower, upper, limit)
+    return {"start": lower, "end": upper, "records": records}
+
+
+@router.get("/export")
+async def audit_export(start: Optional[str] = None, end: Optional[str] = None) -> StreamingResponse:
+    """Stream audit records in the ``audit.log`` JSONL format."""
+    lower = _normalize_timestamp(start, "start")
+    upper = _normalize_timestamp(end, "end")
+    # Starlette drains sync iterators in a threadpool, so large exports never block the loop.
+    return StreamingResponse(audit_logging.export_jsonl(lower, upper), media_type="application/x-ndjson")
+
+
+@router.get("/{file_hash}")
+async def audit_for_file(file_hash: str, limit: int = Query(100, ge=1, le=_MAX_LIMIT)) -> dict:
+    """Return when ``file_hash`` was processed and with which field confidences."""
+    if not utils.is_sha256(file_hash):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a lowercase SHA-256 hex digest.")
+    records = await run_in_threadpool(audit_logging.query_by_hash, file_hash, limit)
+    if not records:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No audit records for this file.")
+    return {"file_sha256": file_hash, "records": records}
@@ -1,68 +1,423 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+import asyncio
+import json
+from typing import AbstractSet, Any, AsyncIterator, Mapping, Optional
 
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from core import config
 from core import logging as audit_logging
 from core import utils
-from services import pdf_text, qa_extract
+from services import deadline, inference, packet, pdf_text, profiling, qa_extract, revisions, workers
 
 router = APIRouter(prefix="", tags=["extract"])
 
+_SINGLE_FIELDS = ("effective_date", "agreement_date", "governing_law")
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
-@router.post("/extract")
-async def extract_entities(file: UploadFile = File(...)) -> dict:
+
+def _entity_payload(field_name: str, record: Mapping[str, Any]) -> dict:
+    """Serialize one winning record; evidence snippets are materialized here."""
+    entity_payload = {
+        "field": field_name,
+        "value": record.get("value"),
+        "page": record.get("page"),
+        "span": record.get("span"),
+        "confidence": record.get("confidence"),
+    }
+    evidence = record.get("evidence")
+    if evidence:
+        entity_payload["evidence"] = evidence
+    return entity_payload
+
+
+def _serialize_entities(extraction: Mapping[str, Any]) -> tuple[list[dict], list[dict]]:
+    entities = []
+    audit_fields = []
+    parties = extraction.get("parties") or []
+    for index, party in enumerate(parties[:2]):
+        field_name = "party_a" if index == 0 else "party_b"
+        entities.append(_entity_payload(field_name, party))
+        audit_fields.append({"field": field_name, "confidence": party.get("confidence", 0.0)})
+    for field_name in _SINGLE_FIELDS:
+        field_value = extraction.get(field_name)
+        if field_value:
+            entities.append(_entity_payload(field_name, field_value))
+            audit_fields.append({"field": field_name, "confidence": field_value.get("confidence", 0.0)})
+    return entities, audit_fields
+
+
+def _parse_fields(raw: Optional[str]) -> frozenset[str]:
+    """Parse a comma-separated ``fields`` selection; empty means every field."""
+    names = [name for name in (raw or "").split(",") if name.strip()]
+    try:
+        return qa_extract.resolve_fields(names or None)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from None
+
+
+def _parse_deadline(raw: Optional[str]) -> Optional[float]:
+    """Parse a ``deadline`` in seconds, falling back to ``EXTRACTION_DEADLINE_SECONDS``."""
+    if raw is None or not raw.strip():
+        return config.EXTRACTION_DEADLINE_SECONDS
+    try:
+        seconds = float(raw)
+    except ValueError:
+        seconds = 0.0
+    if not seconds > 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="deadline must be a positive number of seconds."
+        )
+    return seconds
+
+
+def _is_complete(fields: AbstractSet[str], partial: bool) -> bool:
+    """Whether an extraction covers every field, so it may become a revision baseline."""
+    return fields == frozenset(qa_extract.FIELDS) and not partial
+
+
+async def _read_upload(file: UploadFile) -> tuple[bytes, str]:
     content = await file.read()
     if not content:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty.")
+    return content, utils.sha256_bytes(content)
 
-    file_hash = utils.sha256_bytes(content)
-    timestamp = utils.utc_now_iso()
 
-    pages = pdf_text.extract_pages(content)
+def _require_pages(pages: list[dict]) -> list[dict]:
     if not pages:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Digital PDF text not found; scanned PDFs not supported.",
         )
+    return pages
 
-    extraction = qa_extract.extract_fields(pages)
 
-    entities = []
-    audit_fields = []
+def _parse_pages(content: bytes) -> list[dict]:
+    return _require_pages(pdf_text.extract_pages(content))
 
-    parties = extraction.get("parties", [])
-    for index, party in enumerate(parties[:2]):
-        field_name = "party_a" if index == 0 else "party_b"
-        entity_payload = {
-            "field": field_name,
-            "value": party.get("value"),
-            "page": party.get("page"),
-            "span": party.get("span"),
-            "confidence": party.get("confidence"),
-        }
-        if party.get("evidence"):
-            entity_payload["evidence"] = party["evidence"]
-        entities.append(entity_payload)
-        audit_fields.append({"field": field_name, "confidence": party.get("confidence", 0.0)})
 
-    for field_name in ("effective_date", "agreement_date", "governing_law"):
-        field_value = extraction.get(field_name)
-        if field_value:
-            entity_payload = {
-                "field": field_name,
-                "value": field_value.get("value"),
-                "page": field_value.get("page"),
-                "span": field_value.get("span"),
-                "confidence": field_value.get("confidence"),
-            }
-            if field_value.get("evidence"):
-                entity_payload["evidence"] = field_value["evidence"]
-            entities.append(entity_payload)
-            audit_fields.append({"field": field_name, "confidence": field_value.get("confidence", 0.0)})
+async def _read_pages(file: UploadFile) -> tuple[str, list[dict]]:
+    content, file_hash = await _read_upload(file)
+    return file_hash, await run_in_threadpool(_parse_pages, content)
+
+
+def _extract_inline(
+    content: bytes,
+    file_hash: str,
+    fields: AbstractSet[str],
+    budget_seconds: Optional[float],
+    profile_run: Optional[str],
+) -> tuple[list[dict], dict, dict]:
+    # Runs in the threadpool so concurrent requests each check out a model replica.
+    profiled = profile_run is not None
+    with profiling.session(file_hash, enabled=profiled, run_id=profile_run), deadline.within(budget_seconds):
+        with profiling.span("extract_pages"):
+            pages = _parse_pages(content)
+        with profiling.span("extract_fields", pages=len(pages)), inference.recording() as outputs:
+            extraction = qa_extract.extract_fields(pages, fields=fields)
+    return pages, extraction, outputs.outputs
+
+
+def _extract_revision_inline(content: bytes, prior: Optional[dict]) -> tuple[list[dict], dict, dict]:
+    pages = _parse_pages(content)
+    with inference.recording(prior=prior) as outputs:
+        extraction = qa_extract.extract_fields(pages)
+    return pages, extraction, outputs.outputs
+
+
+async def _extract_in_worker(
+    content: bytes,
+    file_hash: str,
+    fields: AbstractSet[str],
+    deadline_seconds: Optional[float] = None,
+    **options: Any,
+) -> tuple[list[dict], dict, dict]:
+    if fields != frozenset(qa_extract.FIELDS):
+        options["fields"] = sorted(fields)
+    if deadline_seconds is not None:
+        # The worker starts its own clock, so time spent queued for a worker is not counted.
+        options["deadline_seconds"] = deadline_seconds
+    try:
+        result = await run_in_threadpool(workers.get_pool().submit, content, file_hash, **options)
+    except workers.PoolBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="All extraction workers are busy; retry shortly.",
+        ) from None
+    except workers.WorkerError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Extraction worker failed."
+        ) from None
+    return _require_pages(result["pages"]), result["extraction"], result["outputs"]
+
+
+@router.post("/extract")
+async def extract_entities(
+    request: Request,
+    file: UploadFile = File(...),
+    fields: Optional[str] = Form(None),
+    deadline_seconds: Optional[str] = Form(None, alias="deadline"),
+) -> dict:
+    """Extract entities.
+
+    ``fields`` (comma-separated) limits the work done; ``deadline`` (seconds)
+    bounds it, returning resolved fields with ``partial`` and ``skipped_pages``.
+    Both may also be sent as query parameters.
+    """
+    selected = _parse_fields(fields or request.query_params.get("fields"))
+    budget_seconds = _parse_deadline(deadline_seconds or request.query_params.get("deadline"))
+    content, file_hash = await _read_upload(file)
+    timestamp = utils.utc_now_iso()
+    profiled = profiling.is_requested(request.headers, request.query_params)
+    # Each profiled request is stored as its own run, so repeats of one file do not overwrite.
+    profile_run = profiling.new_run_id() if profiled else None
+
+    if config.EXTRACTION_MODE == "process":
+        # Profiles would only cover the parent process, so the opt-in is ignored here.
+        profile_run = None
+        pages, extraction, page_outputs = await _extract_in_worker(
+            content, file_hash, selected, budget_seconds
+        )
+    else:
+        pages, extraction, page_outputs = await run_in_threadpool(
+            _extract_inline, content, file_hash, selected, budget_seconds, profile_run
+        )
+
+    entities, audit_fields = _serialize_entities(extraction)
+
+    audit_logging.append_audit(file_hash, timestamp, audit_fields)
+    # A narrowed or cut-short record would make later revision diffs report missing fields.
+    if _is_complete(selected, bool(extraction.get("partial", False))):
+        revisions.save(file_hash, pages, page_outputs, entities)
+
+    provenance = {"file_sha256": file_hash, "timestamp_utc": timestamp}
+    if profile_run is not None:
+        provenance["profile"] = f"/admin/profiles/{file_hash}/{profile_run}"
+    response: dict[str, Any] = {"entities": entities, "provenance": provenance}
+    if budget_seconds is not None:
+        response["partial"] = bool(extraction.get("partial", False))
+        response["skipped_pages"] = list(extraction.get("skipped_pages", []))
+    return response
+
+
+@router.post("/extract/revision")
+async def extract_revision(
+    file: UploadFile = File(...),
+    previous_sha256: str = Form(...),
+) -> dict:
+    """Re-extract a revised version, running inference only on changed pages."""
+    previous = revisions.load(previous_sha256.strip().lower())
+    if previous is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Previous version not found; extract it with /extract first.",
+        )
+
+    content, file_hash = await _read_upload(file)
+    timestamp = utils.utc_now_iso()
+
+    if config.EXTRACTION_MODE == "process":
+        pages, extraction, page_outputs = await _extract_in_worker(
+            content, file_hash, frozenset(qa_extract.FIELDS), prior=previous.get("outputs")
+        )
+    else:
+        pages, extraction, page_outputs = await run_in_threadpool(
+            _extract_revision_inline, content, previous.get("outputs")
+        )
+
+    entities, audit_fields = _serialize_entities(extraction)
+    changed, reused = revisions.changed_pages(pages, previous)
 
     audit_logging.append_audit(file_hash, timestamp, audit_fields)
+    revisions.save(file_hash, pages, page_outputs, entities)
 
     return {
         "entities": entities,
-        "provenance": {"file_sha256": file_hash, "timestamp_utc": timestamp},
+        "provenance": {
+            "file_sha256": file_hash,
+            "timestamp_utc": timestamp,
+            "previous_sha256": previous["file_sha256"],
+        },
+        "revision": {
+            "changed_pages": changed,
+            "reused_pages": reused,
+            "changes": revisions.diff_entities(previous.get("entities", []), entities),
+        },
+    }
+
+
+def _sse(event: str, data: object) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=True)}\n\n"
+
+
+def _run_stage(
+    outputs: inference.PageOutputs,
+    fields: AbstractSet[str],
+    pages: list[dict],
+    budget: Optional[deadline.Budget],
+) -> dict:
+    with inference.using(outputs), deadline.using(budget):
+        return qa_extract.extract_fields(pages, fields=fields)
+
+
+async def _run_stage_in_worker(
+    outputs: inference.PageOutputs,
+    fields: AbstractSet[str],
+    pages: list[dict],
+    budget: Optional[deadline.Budget],
+    file_hash: str,
+) -> dict:
+    # Earlier stages' outputs go along so shared calls are replayed, not recomputed.
+    remaining = budget.remaining() if budget is not None else None
+    _, extraction, stage_outputs = await _extract_in_worker(
+        b"", file_hash, fields, remaining, pages=pages, prior=outputs.outputs
+    )
+    for digest, calls in stage_outputs.items():
+        outputs.outputs.setdefault(digest, {}).update(calls)
+    if budget is not None:
+        budget.skipped.update(extraction.get("skipped_pages", []))
+        budget.interrupted = budget.interrupted or bool(extraction.get("partial", False))
+    return extraction
+
+
+async def _stream_extraction(
+    file_hash: str, pages: list[dict], fields: AbstractSet[str], budget_seconds: Optional[float] = None
+) -> AsyncIterator[str]:
+    timestamp = utils.utc_now_iso()
+    outputs = inference.PageOutputs()
+    # One budget spans every stage; each stage reads it from its own thread or worker.
+    budget = deadline.Budget(budget_seconds) if budget_seconds is not None else None
+    entities: list[dict] = []
+    audit_fields: list[dict] = []
+
+    yield _sse("pages", {"page_count": len(pages)})
+    for stage in qa_extract.STAGES:
+        if not stage & fields:
+            continue
+        try:
+            if config.EXTRACTION_MODE == "process":
+                partial = await _run_stage_in_worker(outputs, stage & fields, pages, budget, file_hash)
+            else:
+                partial = await run_in_threadpool(_run_stage, outputs, stage & fields, pages, budget)
+        except Exception:
+            # Headers are already sent, so the failure is reported in-band; the
+            # audit trail still records what was resolved before it.
+            audit_logging.append_audit(file_hash, timestamp, audit_fields)
+            yield _sse("error", {"detail": "Extraction failed.", "fields": sorted(stage & fields)})
+            return
+        stage_entities, stage_audit = _serialize_entities(partial)
+        for entity in stage_entities:
+            yield _sse("entity", entity)
+        entities.extend(stage_entities)
+        audit_fields.extend(stage_audit)
+
+    audit_logging.append_audit(file_hash, timestamp, audit_fields)
+    if _is_complete(fields, budget is not None and budget.partial):
+        revisions.save(file_hash, pages, outputs.outputs, entities)
+    provenance: dict[str, Any] = {"file_sha256": file_hash, "timestamp_utc": timestamp}
+    if budget is not None:
+        provenance["partial"] = budget.partial
+        provenance["skipped_pages"] = budget.skipped_pages
+    yield _sse("provenance", provenance)
+
+
+@router.post("/extract/stream")
+async def extract_entities_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    fields: Optional[str] = Form(None),
+    deadline_seconds: Optional[str] = Form(None, alias="deadline"),
+) -> StreamingResponse:
+    """Stream Server-Sent Events: page count, each entity as resolved, then provenance.
+
+    With a ``deadline`` the provenance event carries ``partial`` and ``skipped_pages``.
+    """
+    selected = _parse_fields(fields or request.query_params.get("fields"))
+    budget_seconds = _parse_deadline(deadline_seconds or request.query_params.get("deadline"))
+    file_hash, pages = await _read_pages(file)
+    return StreamingResponse(
+        _stream_extraction(file_hash, pages, selected, budget_seconds),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+async def _extract_packet_in_workers(
+    file_hash: str, pages: list[dict], fields: AbstractSet[str], budget_seconds: Optional[float]
+) -> list[dict]:
+    documents = packet.split_packet(pages)
+    budget = deadline.Budget(budget_seconds) if budget_seconds is not None else None
+    # Leave half the workers for other requests; queued sub-documents wait here,
+    # not in the pool queue where they would time out as 503s.
+    in_flight = asyncio.Semaphore(max(1, workers.get_pool().size // 2))
+
+    async def extract_one(document: dict) -> tuple[list[dict], dict, dict]:
+        async with in_flight:
+            # Each worker starts its own clock, so hand it what is left of the packet's budget.
+            remaining = budget.remaining() if budget is not None else None
+            return await _extract_in_worker(b"", file_hash, fields, remaining, pages=document["pages"])
+
+    results = await asyncio.gather(*(extract_one(document) for document in documents))
+    return [
+        {
+            "start_page": document["start_page"],
+            "end_page": document["end_page"],
+            "signals": document["signals"],
+            "extraction": extraction,
+        }
+        for document, (_, extraction, _) in zip(documents, results)
+    ]
+
+
+@router.post("/extract/packet")
+async def extract_packet(
+    request: Request,
+    file: UploadFile = File(...),
+    fields: Optional[str] = Form(None),
+    deadline_seconds: Optional[str] = Form(None, alias="deadline"),
+) -> dict:
+    """Split a PDF bundling several agreements and extract each sub-document concurrently.
+
+    A ``deadline`` covers the whole packet; each document then reports
+    ``partial`` and ``skipped_pages``.
+    """
+    selected = _parse_fields(fields or request.query_params.get("fields"))
+    budget_seconds = _parse_deadline(deadline_seconds or request.query_params.get("deadline"))
+    file_hash, pages = await _read_pages(file)
+    timestamp = utils.utc_now_iso()
+
+    if config.EXTRACTION_MODE == "process":
+        results = await _extract_packet_in_workers(file_hash, pages, selected, budget_seconds)
+    else:
+        results = await run_in_threadpool(
+            packet.extract_packet, pages, selected, deadline_seconds=budget_seconds
+        )
+
+    documents = []
+    audit_fields: list[dict] = []
+    for index, result in enumerate(results, start=1):
+        extraction = result["extraction"]
+        entities, document_audit = _serialize_entities(extraction)
+        audit_fields.extend(
+            {**entry, "document": index, "start_page": result["start_page"]} for entry in document_audit
+        )
+        document: dict[str, Any] = {
+            "document": index,
+            "start_page": result["start_page"],
+            "end_page": result["end_page"],
+            "boundary_signals": result["signals"],
+            "entities": entities,
+        }
+        if budget_seconds is not None:
+            document["partial"] = bool(extraction.get("partial", False))
+            document["skipped_pages"] = list(extraction.get("skipped_pages", []))
+        documents.append(document)
+
+    audit_logging.append_audit(file_hash, timestamp, audit_fields)
+    return {
+        "documents": documents,
+        "provenance": {"file_sha256": file_hash, "timestamp_utc": timestamp, "page_count": len(pages)},
     }
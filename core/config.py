@@ -2,14 +2,52 @@
 from __future__ import annotations
 
 from datetime import timezone
+import os
 import re
-from typing import Final
+from typing import Final, Optional
 
 QA_MODEL_NAME: Final[str] = "akdeniz27/roberta-base-cuad"
 NER_MODEL_NAME: Final[str] = "dslim/bert-base-NER"
+QA_MODEL_REVISION: Final[str] = "main"
+NER_MODEL_REVISION: Final[str] = "main"
+PDF_TEXT_BACKEND: Final[str] = "pdfplumber"
+# Each replica holds its own weights (~0.5 GB for QA), so the default is capped;
+# torch threads are split so the replicas still cover every core.
+MODEL_POOL_SIZE: Final[int] = min(4, max(1, (os.cpu_count() or 1) // 2))
+MODEL_TORCH_THREADS: Final[Optional[int]] = None  # None = cores // MODEL_POOL_SIZE
 QA_SCORE_THRESHOLD: Final[float] = 0.25
+QA_WINDOW_CHARS_BEFORE: Final[int] = 200
+QA_WINDOW_CHARS_AFTER: Final[int] = 600
 MAX_SNIPPET_CHARS: Final[int] = 80
 AUDIT_LOG_PATH: Final[str] = "audit.log"
+AUDIT_BACKEND: Final[str] = "jsonl"  # or "sqlite" for the indexed store
+AUDIT_DB_PATH: Final[str] = "audit.db"
+AUDIT_RETENTION_DAYS: Final[int] = 365  # 0 keeps records forever
+AUDIT_COMPACTION_INTERVAL_SECONDS: Final[float] = 3600.0
+REVISION_STORE_DIR: Final[str] = "revisions"
+REVISION_RETENTION_DAYS: Final[int] = 90  # 0 keeps records forever
+REVISION_PURGE_INTERVAL_SECONDS: Final[float] = 3600.0
+PAGE_CACHE_ENABLED: Final[bool] = True
+PAGE_CACHE_PATH: Final[str] = "page_cache.db"
+PAGE_CACHE_MAX_ENTRIES: Final[int] = 200_000
+PROFILING_ENABLED: Final[bool] = False  # /admin has no auth; never expose it publicly
+PROFILE_DIR: Final[str] = "profiles"
+PROFILE_RETENTION_DAYS: Final[int] = 7  # 0 keeps profiles forever
+PROFILE_PURGE_INTERVAL_SECONDS: Final[float] = 3600.0
+EXTRACTION_MODE: Final[str] = "inline"  # or "process" for the worker pool
+WORKER_PROCESSES: Final[int] = max(1, (os.cpu_count() or 2) - 1)
+WORKER_MAX_DOCUMENTS: Final[int] = 200
+WORKER_MAX_RSS_MB: Final[float] = 3072.0
+WORKER_QUEUE_TIMEOUT_SECONDS: Final[float] = 30.0
+WORKER_JOB_TIMEOUT_SECONDS: Final[Optional[float]] = 600.0  # hung workers are killed after this
+EXTRACTION_DEADLINE_SECONDS: Final[Optional[float]] = None  # per-request default; None = unbounded
+DEADLINE_PREAMBLE_PAGES: Final[int] = 2
+DISPATCHER_BACKENDS: Final[tuple[str, ...]] = ("http://127.0.0.1:8001", "http://127.0.0.1:8002")
+DISPATCHER_VIRTUAL_NODES: Final[int] = 128
+DISPATCHER_EJECT_AFTER_FAILURES: Final[int] = 2
+DISPATCHER_HEALTH_INTERVAL_SECONDS: Final[float] = 2.0
+DISPATCHER_HEALTH_TIMEOUT_SECONDS: Final[float] = 1.0
+DISPATCHER_REQUEST_TIMEOUT_SECONDS: Final[float] = 600.0
 DEFAULT_TIMEZONE = timezone.utc
 
 DATE_REGEX: Final[str] = (
@@ -76,3 +114,50 @@ PARTY_EXCLUSION_TERMS: Final[tuple[str, ...]] = (
     "schedule",
     "exhibit",
 )
+
+# Ordered strongest first; a bare "laws of" is not a cue because incorporation
+# recitals ("organized under the laws of Delaware") use it too.
+GOVERNING_LAW_CUES: Final[tuple[str, ...]] = (
+    "governed by",
+    "governing law",
+    "construed in accordance with",
+    "construed under",
+    "interpreted in accordance with",
+    "subject to the laws of",
+)
+
+PACKET_BOUNDARY_THRESHOLD: Final[int] = 3
+PACKET_PREAMBLE_CHARS: Final[int] = 600
+PACKET_TITLE_TERMS: Final[tuple[str, ...]] = (
+    "AGREEMENT",
+    "AMENDMENT",
+    "ADDENDUM",
+    "CONTRACT",
+    "LEASE",
+    "LICENSE",
+    "STATEMENT OF WORK",
+    "MEMORANDUM OF UNDERSTANDING",
+    "PROMISSORY NOTE",
+    "ORDER FORM",
+)
+# Pages headed like these continue the preceding agreement rather than open a new one.
+PACKET_ATTACHMENT_TERMS: Final[tuple[str, ...]] = (
+    "EXHIBIT",
+    "SCHEDULE",
+    "ANNEX",
+    "APPENDIX",
+    "ATTACHMENT",
+)
+PACKET_PREAMBLE_CUES: Final[tuple[str, ...]] = (
+    "by and between",
+    "by and among",
+    "entered into by",
+    "is made and entered into",
+)
+PACKET_SIGNATURE_CUES: Final[tuple[str, ...]] = (
+    "signature",
+    "by:",
+    "name:",
+    "title:",
+    "authorized signatory",
+)
@@ -1,24 +1,225 @@
-"""Audit logging helpers."""
+"""Audit logging helpers.
+
+Records go either to the flat JSONL ``AUDIT_LOG_PATH`` file or, with
+``AUDIT_BACKEND = "sqlite"``, to an indexed SQLite store in WAL mode that
+supports lookups by file hash and time range, retention and JSONL export.
+"""
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
 
 from core import config
 
+AuditRecord = Dict[str, object]
+_FIELD_TAGS = ("document", "start_page")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit (
+    id INTEGER PRIMARY KEY,
+    file_sha256 TEXT NOT NULL,
+    timestamp_utc TEXT NOT NULL,
+    fields TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_file_ts ON audit (file_sha256, timestamp_utc);
+CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit (timestamp_utc);
+"""
+
+
+class AuditStore:
+    """SQLite-backed audit store; timestamps are ISO-8601 UTC so they sort as text."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # auto_vacuum only takes effect on a new database, before the first table exists.
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def append(self, record: Mapping[str, object]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO audit (file_sha256, timestamp_utc, fields) VALUES (?, ?, ?)",
+                (record["file_sha256"], record["timestamp_utc"], json.dumps(record["fields"], ensure_ascii=True)),
+            )
+
+    def _select(self, where: str, params: tuple, limit: Optional[int]) -> List[AuditRecord]:
+        sql = f"SELECT file_sha256, timestamp_utc, fields FROM audit WHERE {where} ORDER BY timestamp_utc"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"file_sha256": row[0], "timestamp_utc": row[1], "fields": json.loads(row[2])}
+            for row in rows
+        ]
+
+    def by_hash(self, file_hash: str, limit: Optional[int] = None) -> List[AuditRecord]:
+        return self._select("file_sha256 = ?", (file_hash,), limit)
+
+    def in_range(
+        self, start: Optional[str], end: Optional[str], limit: Optional[int] = None
+    ) -> List[AuditRecord]:
+        clauses, params = ["1 = 1"], []
+        if start is not None:
+            clauses.append("timestamp_utc >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp_utc < ?")
+            params.append(end)
+        return self._select(" AND ".join(clauses), tuple(params), limit)
+
+    def iter_range(
+        self, start: Optional[str], end: Optional[str], batch_size: int = 1000
+    ) -> Iterator[AuditRecord]:
+        """Yield records in ``[start, end)`` in keyset-paginated batches."""
+        cursor = (start or "", 0)
+        while True:
+            where = "(timestamp_utc, id) > (?, ?)"
+            params: tuple = cursor
+            if end is not None:
+                where += " AND timestamp_utc < ?"
+                params = (*params, end)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, file_sha256, timestamp_utc, fields FROM audit WHERE {where} "
+                    "ORDER BY timestamp_utc, id LIMIT ?",
+                    (*params, batch_size),
+                ).fetchall()
+            for row in rows:
+                yield {"file_sha256": row[1], "timestamp_utc": row[2], "fields": json.loads(row[3])}
+            if len(rows) < batch_size:
+                return
+            cursor = (rows[-1][2], rows[-1][0])
+
+    def compact(self, cutoff: str) -> int:
+        """Delete records older than ``cutoff`` and return freed pages to the filesystem."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM audit WHERE timestamp_utc < ?", (cutoff,)).rowcount
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_STORE: Optional[AuditStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> AuditStore:
+    """Return the process-wide SQLite store for ``config.AUDIT_DB_PATH``."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.path != config.AUDIT_DB_PATH:
+            if _STORE is not None:
+                _STORE.close()
+            _STORE = AuditStore(config.AUDIT_DB_PATH)
+        return _STORE
+
+
+def reset_store() -> None:
+    """Close the process-wide store; primarily useful for tests."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is not None:
+            _STORE.close()
+        _STORE = None
 
-def append_audit(file_hash: str, timestamp: str, fields: Iterable[Mapping[str, float]]) -> None:
-    """Append a structured audit record; excludes raw document content."""
+
+def _uses_sqlite() -> bool:
+    return config.AUDIT_BACKEND == "sqlite"
+
+
+def _audit_field(entry: Mapping[str, object]) -> Dict[str, object]:
+    field: Dict[str, object] = {"field": entry.get("field"), "confidence": float(entry.get("confidence", 0.0))}
+    for tag in _FIELD_TAGS:
+        if entry.get(tag) is not None:
+            field[tag] = int(entry[tag])
+    return field
+
+
+def append_audit(file_hash: str, timestamp: str, fields: Iterable[Mapping[str, object]]) -> None:
+    """Append a structured audit record; excludes raw document content.
+
+    Fields from a packet carry the ``document`` number and ``start_page`` of
+    the sub-document they came from.
+    """
     record = {
         "file_sha256": file_hash,
         "timestamp_utc": timestamp,
-        "fields": [
-            {"field": entry.get("field"), "confidence": float(entry.get("confidence", 0.0))}
-            for entry in fields
-        ],
+        "fields": [_audit_field(entry) for entry in fields],
     }
+    if _uses_sqlite():
+        get_store().append(record)
+        return
     path = Path(config.AUDIT_LOG_PATH)
     with path.open("a", encoding="utf-8") as handle:
         handle.write(json.dumps(record, ensure_ascii=True))
         handle.write("\n")
+
+
+def _scan_jsonl() -> Iterator[AuditRecord]:
+    path = Path(config.AUDIT_LOG_PATH)
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def query_by_hash(file_hash: str, limit: Optional[int] = None) -> List[AuditRecord]:
+    """Return audit records for ``file_hash`` in timestamp order."""
+    if _uses_sqlite():
+        return get_store().by_hash(file_hash, limit)
+    matches = sorted(
+        (record for record in _scan_jsonl() if record.get("file_sha256") == file_hash),
+        key=lambda record: str(record.get("timestamp_utc")),
+    )
+    return matches[:limit] if limit is not None else matches
+
+
+def query_range(
+    start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None
+) -> List[AuditRecord]:
+    """Return records with ``start <= timestamp_utc < end`` (ISO-8601 UTC strings)."""
+    if _uses_sqlite():
+        return get_store().in_range(start, end, limit)
+    matches = sorted(
+        (
+            record
+            for record in _scan_jsonl()
+            if (start is None or str(record.get("timestamp_utc")) >= start)
+            and (end is None or str(record.get("timestamp_utc")) < end)
+        ),
+        key=lambda record: str(record.get("timestamp_utc")),
+    )
+    return matches[:limit] if limit is not None else matches
+
+
+def compact(now: Optional[datetime] = None) -> int:
+    """Apply ``AUDIT_RETENTION_DAYS`` to the SQLite store; returns deleted record count."""
+    if not _uses_sqlite() or config.AUDIT_RETENTION_DAYS <= 0:
+        return 0
+    current = now or datetime.now(tz=config.DEFAULT_TIMEZONE)
+    cutoff = (current - timedelta(days=config.AUDIT_RETENTION_DAYS)).isoformat()
+    return get_store().compact(cutoff)
+
+
+def export_jsonl(start: Optional[str] = None, end: Optional[str] = None) -> Iterator[str]:
+    """Yield records in the original ``audit.log`` JSONL line format."""
+    records = get_store().iter_range(start, end) if _uses_sqlite() else iter(query_range(start, end))
+    for record in records:
+        yield json.dumps(record, ensure_ascii=True) + "\n"
@@ -1,31 +1,195 @@
-"""Model loader utilities for QA and NER pipelines."""
+"""Model loader utilities for QA and NER pipelines.
+
+Hugging Face pipelines are not safe for concurrent use, so inference checks
+out a replica from a per-kind pool of ``MODEL_POOL_SIZE`` pipelines and
+returns it afterwards. ``get_qa``/``get_ner`` remain the loaders for the first
+replica; swapping them out (tests, load-test stubs) rebuilds the pools.
+"""
 from __future__ import annotations
 
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
 from functools import lru_cache
-from typing import Any
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from transformers import pipeline
 
 from core import config
 
 
+def _build_qa() -> Any:
+    return pipeline(
+        "question-answering",
+        model=config.QA_MODEL_NAME,
+        revision=config.QA_MODEL_REVISION,
+    )
+
+
+def _build_ner() -> Any:
+    return pipeline(
+        "token-classification",
+        model=config.NER_MODEL_NAME,
+        revision=config.NER_MODEL_REVISION,
+        aggregation_strategy="simple",
+    )
+
+
 @lru_cache(maxsize=1)
 def get_qa() -> Any:
     """Return the question-answering pipeline instance."""
-    return pipeline("question-answering", model=config.QA_MODEL_NAME)
+    return _build_qa()
 
 
 @lru_cache(maxsize=1)
 def get_ner() -> Any:
     """Return the token-classification pipeline instance."""
-    return pipeline(
-        "token-classification",
-        model=config.NER_MODEL_NAME,
-        aggregation_strategy="simple",
-    )
+    return _build_ner()
+
+
+class ReplicaPool:
+    """Fixed set of pipeline replicas, each used by one caller at a time."""
+
+    def __init__(self, kind: str, replicas: List[Any], loader: Callable[[], Any]) -> None:
+        self.kind = kind
+        self.size = len(replicas)
+        self.loader = loader
+        # Commit the weights were resolved to; stubs and offline copies have none.
+        model_config = getattr(getattr(replicas[0], "model", None), "config", None) if replicas else None
+        self.commit_hash: Optional[str] = getattr(model_config, "_commit_hash", None)
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        for replica in replicas:
+            self._idle.put(replica)
+        self._lock = threading.Lock()
+        self._created = time.perf_counter()
+        self.in_use = 0
+        self.checkouts = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        """Borrow a replica for the enclosed block, blocking until one is free."""
+        requested = time.perf_counter()
+        replica = self._idle.get()
+        acquired = time.perf_counter()
+        wait = acquired - requested
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            if wait > 0.001:
+                self.waited += 1
+        try:
+            yield replica
+        finally:
+            with self._lock:
+                self.in_use -= 1
+                self.busy_seconds += time.perf_counter() - acquired
+            self._idle.put(replica)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            elapsed = time.perf_counter() - self._created
+            return {
+                "replicas": self.size,
+                "in_use": self.in_use,
+                "checkouts": self.checkouts,
+                "waited": self.waited,
+                "wait_ms_avg": self.wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0,
+                "wait_ms_max": self.max_wait_seconds * 1000,
+                "utilization": self.busy_seconds / (elapsed * self.size) if elapsed else 0.0,
+            }
+
+
+_DEFAULT_LOADERS: Dict[str, Callable[[], Any]] = {"qa": get_qa, "ner": get_ner}
+_BUILDERS: Dict[str, Callable[[], Any]] = {"qa": _build_qa, "ner": _build_ner}
+_POOLS: Dict[str, ReplicaPool] = {}
+_POOLS_LOCK = threading.Lock()
+_COMMIT_HASH = re.compile(r"[0-9a-f]{40}")
+
+
+def _current_loader(kind: str) -> Callable[[], Any]:
+    return get_qa if kind == "qa" else get_ner
+
+
+def torch_threads() -> int:
+    """Intra-op threads per process: the configured count, or the cores split across replicas."""
+    if config.MODEL_TORCH_THREADS:
+        return max(1, config.MODEL_TORCH_THREADS)
+    return max(1, (os.cpu_count() or 1) // max(1, config.MODEL_POOL_SIZE))
+
+
+def _configure_torch_threads() -> None:
+    # Intra-op threads are process-wide in torch; size them so replicas share the cores.
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(torch_threads())
+
+
+def _pool(kind: str) -> ReplicaPool:
+    loader = _current_loader(kind)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(kind)
+        if pool is None or pool.loader is not loader:
+            if not _POOLS:
+                _configure_torch_threads()
+            # A swapped-in loader (e.g. a stub) also supplies the extra replicas.
+            extra = _BUILDERS[kind] if loader is _DEFAULT_LOADERS[kind] else loader
+            replicas = [loader()] + [extra() for _ in range(max(1, config.MODEL_POOL_SIZE) - 1)]
+            pool = _POOLS[kind] = ReplicaPool(kind, replicas, loader)
+        return pool
+
+
+@contextmanager
+def checkout(kind: str) -> Iterator[Any]:
+    """Borrow a ``"qa"`` or ``"ner"`` pipeline replica for the enclosed block."""
+    with _pool(kind).checkout() as replica:
+        yield replica
+
+
+def _configured_revision(kind: str) -> str:
+    return config.QA_MODEL_REVISION if kind == "qa" else config.NER_MODEL_REVISION
+
+
+def revision(kind: str) -> str:
+    """Return the commit the ``kind`` pipeline runs, resolving a floating ref.
+
+    A configured commit hash is returned as is; a branch or tag such as
+    ``main`` is resolved by loading the pipeline and reading its commit.
+    """
+    configured = _configured_revision(kind)
+    if _COMMIT_HASH.fullmatch(configured):
+        return configured
+    return _pool(kind).commit_hash or configured
+
+
+def warm() -> None:
+    """Load every replica of both pipelines up front."""
+    _pool("qa")
+    _pool("ner")
+
+
+def pool_stats() -> Optional[Dict[str, object]]:
+    """Utilization and wait-time stats per pipeline kind, once pools exist."""
+    with _POOLS_LOCK:
+        pools = dict(_POOLS)
+    if not pools:
+        return None
+    return {kind: pool.stats() for kind, pool in pools.items()}
 
 
 def clear_caches() -> None:
-    """Reset cached pipelines; primarily useful for tests."""
-    get_qa.cache_clear()
-    get_ner.cache_clear()
+    """Reset cached pipelines and replica pools; primarily useful for tests."""
+    for loader in _DEFAULT_LOADERS.values():
+        loader.cache_clear()  # type: ignore[attr-defined]
+    with _POOLS_LOCK:
+        _POOLS.clear()
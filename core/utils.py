@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import hashlib
+import re
 from datetime import datetime
 from typing import Optional
 
 from core import config
 
+_SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
 
 def sha256_bytes(data: bytes) -> str:
     """Return the SHA-256 hex digest for the provided bytes."""
@@ -15,6 +18,11 @@ def sha256_bytes(data: bytes) -> str:
     return digest.hexdigest()
 
 
+def is_sha256(value: str) -> bool:
+    """Return True when ``value`` is a lowercase SHA-256 hex digest."""
+    return bool(_SHA256_PATTERN.fullmatch(value))
+
+
 def utc_now_iso() -> str:
     """Return the current UTC timestamp in ISO-8601 format."""
     return datetime.now(tz=config.DEFAULT_TIMEZONE).isoformat()
@@ -0,0 +1,57 @@
+"""Compare page throughput of the PDF text backends.
+
+Usage: ``python -m eval.bench_pdf_text [--pages 40] [--repeat 3] [sample.pdf ...]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from eval.synthetic_pdf import contract_pdf
+from services import pdf_text
+
+
+def _load_inputs(paths: List[str], pages: int) -> List[bytes]:
+    if paths:
+        return [Path(path).read_bytes() for path in paths]
+    return [contract_pdf(pages, seed=seed) for seed in range(3)]
+
+
+def run(inputs: List[bytes], repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name in pdf_text.BACKENDS:
+        page_total = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for pdf_bytes in inputs:
+                page_total += len(pdf_text.extract_pages(pdf_bytes, backend=name))
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "pages": float(page_total),
+            "seconds": elapsed,
+            "pages_per_sec": page_total / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdfs", nargs="*", help="PDF files to parse (defaults to synthetic contracts)")
+    parser.add_argument("--pages", type=int, default=40, help="pages per synthetic contract")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(_load_inputs(args.pdfs, args.pages), args.repeat)
+    baseline = results["pdfplumber"]["pages_per_sec"]
+    for name, stats in results.items():
+        speedup = stats["pages_per_sec"] / baseline if baseline else 0.0
+        print(
+            f"{name}: {stats['pages_per_sec']:.1f} pages/sec "
+            f"({int(stats['pages'])} pages in {stats['seconds']:.2f}s, {speedup:.1f}x pdfplumber)"
+        )
+
+
+if __name__ == "__main__":
+    main()
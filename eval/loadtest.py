@@ -0,0 +1,235 @@
+"""Concurrency load test for the extraction API.
+
+Drives ``/extract`` with synthetic PDFs of mixed sizes at several concurrency
+levels, either in-process through the ASGI app or against a running server,
+while polling ``/health`` to observe event-loop lag. Results are written as JSON
+so runs can be compared over time.
+
+Usage::
+
+    python -m eval.loadtest --stub-models                  # in-process, no model downloads
+    python -m eval.loadtest --base-url http://localhost:8000 --concurrency 1 4 16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from core import utils
+from eval.synthetic_pdf import contract_pdf
+
+_HEALTH_INTERVAL_SECONDS = 0.05
+_REQUEST_TIMEOUT_SECONDS = 600.0
+
+
+class _StubQA:
+    """Mirrors the test stub; ``latency`` simulates blocking CPU inference."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        return {"answer": "", "score": 0.0}
+
+
+class _StubNER:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def __call__(self, *args: Any, **kwargs: Any) -> List[Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        return []
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _summary_ms(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(values, 50) * 1000,
+        "p95": percentile(values, 95) * 1000,
+        "p99": percentile(values, 99) * 1000,
+        "max": (max(values) if values else 0.0) * 1000,
+    }
+
+
+def build_corpus(sizes: Sequence[int], variants: int) -> List[bytes]:
+    """Return distinct synthetic PDFs cycling through ``sizes`` pages."""
+    return [
+        contract_pdf(sizes[index % len(sizes)], seed=index)
+        for index in range(max(variants, len(sizes)))
+    ]
+
+
+def _configure_in_process(stub_latency: Optional[float], state_dir: Path) -> Any:
+    from core import config, model
+
+    config.AUDIT_LOG_PATH = str(state_dir / "audit.log")
+    config.REVISION_STORE_DIR = str(state_dir / "revisions")
+    config.PAGE_CACHE_PATH = str(state_dir / "page_cache.db")
+    if stub_latency is not None:
+        qa, ner = _StubQA(stub_latency), _StubNER(stub_latency)
+        model.get_qa = lambda: qa
+        model.get_ner = lambda: ner
+
+    from app.main import app
+
+    return app
+
+
+async def _poll_health(client: httpx.AsyncClient, stop: asyncio.Event, samples: List[float]) -> None:
+    # Measure from when each poll was due, so time spent waiting for a blocked loop counts as lag.
+    due = time.perf_counter()
+    while not stop.is_set():
+        try:
+            await client.get("/health")
+            samples.append(time.perf_counter() - due)
+        except httpx.HTTPError:
+            pass
+        due = max(due + _HEALTH_INTERVAL_SECONDS, time.perf_counter())
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=max(0.0, due - time.perf_counter()))
+        except asyncio.TimeoutError:
+            continue
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    corpus: Sequence[bytes],
+    concurrency: int,
+    total_requests: int,
+) -> Dict[str, Any]:
+    """Issue ``total_requests`` uploads with ``concurrency`` in flight and summarize."""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    health_samples: List[float] = []
+    counter = itertools.count()
+    stop = asyncio.Event()
+
+    async def worker() -> None:
+        nonlocal errors
+        while (index := next(counter)) < total_requests:
+            pdf_bytes = corpus[index % len(corpus)]
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    endpoint, files={"file": (f"load-{index}.pdf", pdf_bytes, "application/pdf")}
+                )
+                code = str(response.status_code)
+            except httpx.HTTPError:
+                code = "exception"
+            latencies.append(time.perf_counter() - started)
+            statuses[code] = statuses.get(code, 0) + 1
+            if code == "exception" or not code.startswith("2"):
+                errors += 1
+            # In-process calls may complete without suspending; yield so the health poller runs.
+            await asyncio.sleep(0)
+
+    poller = asyncio.create_task(_poll_health(client, stop, health_samples))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await poller
+
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "duration_s": elapsed,
+        "throughput_rps": total_requests / elapsed if elapsed else 0.0,
+        "latency_ms": _summary_ms(latencies),
+        "error_rate": errors / total_requests if total_requests else 0.0,
+        "rate_503": statuses.get("503", 0) / total_requests if total_requests else 0.0,
+        "status_counts": statuses,
+        "event_loop_lag_ms": {**_summary_ms(health_samples), "samples": len(health_samples)},
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    corpus = build_corpus(args.sizes, args.variants)
+    timeout = httpx.Timeout(_REQUEST_TIMEOUT_SECONDS)
+    with tempfile.TemporaryDirectory(prefix="legal-mvp-load-") as state_dir:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=timeout)
+            target = args.base_url
+        else:
+            stub_latency = args.stub_latency_ms / 1000 if args.stub_models else None
+            app = _configure_in_process(stub_latency, Path(state_dir))
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(transport=transport, base_url="http://in-process", timeout=timeout)
+            target = "in-process"
+        async with client:
+            # One untimed request so model loading is not charged to the first level.
+            await client.post(args.endpoint, files={"file": ("warmup.pdf", corpus[0], "application/pdf")})
+            levels = []
+            for concurrency in args.concurrency:
+                total = max(args.requests, concurrency)
+                levels.append(await run_level(client, args.endpoint, corpus, concurrency, total))
+    return {
+        "meta": {
+            "timestamp_utc": utils.utc_now_iso(),
+            "target": target,
+            "endpoint": args.endpoint,
+            "stub_models": bool(args.stub_models) and not args.base_url,
+            "stub_latency_ms": args.stub_latency_ms if args.stub_models else None,
+            "page_sizes": list(args.sizes),
+            "distinct_documents": len(corpus),
+        },
+        "levels": levels,
+    }
+
+
+def _print_table(results: Dict[str, Any]) -> None:
+    print(f"target={results['meta']['target']} endpoint={results['meta']['endpoint']}")
+    print("conc  reqs   rps     p50ms    p95ms    p99ms    err%   503%   lag_p99ms")
+    for level in results["levels"]:
+        latency = level["latency_ms"]
+        print(
+            f"{level['concurrency']:>4}  {level['requests']:>4}  {level['throughput_rps']:>6.2f}  "
+            f"{latency['p50']:>7.1f}  {latency['p95']:>7.1f}  {latency['p99']:>7.1f}  "
+            f"{level['error_rate'] * 100:>5.1f}  {level['rate_503'] * 100:>5.1f}  "
+            f"{level['event_loop_lag_ms']['p99']:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the extraction API.")
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--endpoint", default="/extract")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=64, help="requests per level (at least the concurrency)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 20], help="page counts to mix")
+    parser.add_argument("--variants", type=int, default=12, help="distinct synthetic documents")
+    parser.add_argument("--stub-models", action="store_true", help="in-process only: use stub pipelines")
+    parser.add_argument("--stub-latency-ms", type=float, default=5.0, help="blocking time per stub call")
+    parser.add_argument("--output", default="loadtest_results.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    _print_table(results)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Synthetic contract PDFs for benchmarks, load tests and backend parity checks."""
+from __future__ import annotations
+
+import random
+import textwrap
+from typing import List, Sequence
+
+_LINE_WIDTH = 88
+_LINES_PER_PAGE = 48
+_FILLER = (
+    "Each party shall perform its obligations in a timely and workmanlike manner.",
+    "Invoices are payable within thirty days of receipt unless disputed in good faith.",
+    "Confidential Information shall be used solely for the purposes of this Agreement.",
+    "Neither party may assign this Agreement without the prior written consent of the other.",
+    "Notices must be delivered in writing to the addresses set out in Schedule A.",
+    "The limitation of liability set out herein shall survive termination of this Agreement.",
+)
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _content_stream(lines: Sequence[str]) -> bytes:
+    parts = ["BT", "/F1 10 Tf", "14 TL", "56 760 Td"]
+    for line in lines:
+        parts.append(f"({_escape(line)}) Tj T*")
+    parts.append("ET")
+    return "\n".join(parts).encode("latin-1")
+
+
+def build_pdf(pages: Sequence[Sequence[str]]) -> bytes:
+    """Return a minimal digital PDF with one Helvetica text block per page."""
+    page_count = len(pages)
+    font_id = 3
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once page object ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids: List[str] = []
+    for lines in pages:
+        stream = _content_stream(lines)
+        content_id = len(objects) + 1
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_id = len(objects) + 1
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode("latin-1")
+        )
+        kids.append(f"{page_id} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets: List[int] = []
+    for index, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % index + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += (
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    )
+    return bytes(output)
+
+
+def contract_pages(page_count: int, seed: int = 0) -> List[List[str]]:
+    """Return wrapped lines for a contract with a preamble, filler and governing law page."""
+    rng = random.Random(seed)
+    preamble = (
+        "MASTER SERVICES AGREEMENT. This Master Services Agreement dated 3 October 2025 "
+        "is made by and between Alpha Holdings Corp, a Delaware corporation (the Seller), "
+        "and Beta Logistics LLC (the Buyer), effective as of 1 November 2025."
+    )
+    pages: List[List[str]] = []
+    for number in range(1, page_count + 1):
+        paragraphs: List[str] = [preamble] if number == 1 else []
+        while sum(len(textwrap.wrap(p, _LINE_WIDTH)) for p in paragraphs) < _LINES_PER_PAGE - 6:
+            paragraphs.append(" ".join(rng.choice(_FILLER) for _ in range(3)))
+        if number == page_count:
+            paragraphs.append(
+                "Governing Law. This Agreement shall be governed by the laws of the State of New York."
+            )
+        lines = [line for paragraph in paragraphs for line in textwrap.wrap(paragraph, _LINE_WIDTH)]
+        lines.append(f"Page {number} of {page_count}")
+        pages.append(lines)
+    return pages
+
+
+def contract_pdf(page_count: int, seed: int = 0) -> bytes:
+    """Return a synthetic contract PDF with ``page_count`` pages."""
+    return build_pdf(contract_pages(page_count, seed))
+
+
+__all__ = ["build_pdf", "contract_pages", "contract_pdf"]
@@ -0,0 +1,79 @@
+"""Compact candidate records shared by the QA and NER extraction passes."""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+from core import utils
+
+_NORM_PATTERN = re.compile(r"[^a-z0-9]")
+_RECORD_KEYS = ("value", "page", "span", "confidence", "evidence")
+
+
+class Candidate:
+    """Slotted extraction candidate holding offsets into the shared page text.
+
+    Evidence snippets are only sliced when read, so candidates discarded by
+    deduplication never pay for them. ``get`` and item access mirror the
+    plain-dict records the router and evaluation harness already consume.
+    """
+
+    __slots__ = ("value", "page", "start", "end", "confidence", "_text", "_norm")
+
+    def __init__(
+        self,
+        value: str,
+        page: int,
+        span: Optional[List[int]],
+        confidence: float,
+        text: str,
+    ) -> None:
+        self.value = value
+        self.page = page
+        self.start: Optional[int] = span[0] if span else None
+        self.end: Optional[int] = span[1] if span else None
+        self.confidence = confidence
+        self._text = text
+        self._norm: Optional[str] = None
+
+    @property
+    def span(self) -> Optional[List[int]]:
+        if self.start is None or self.end is None:
+            return None
+        return [self.start, self.end]
+
+    @property
+    def norm(self) -> str:
+        """Normalization key used for deduplication, computed once."""
+        if self._norm is None:
+            self._norm = _NORM_PATTERN.sub("", self.value.lower())
+        return self._norm
+
+    @property
+    def evidence(self) -> Optional[str]:
+        if self.start is None:
+            return None
+        return utils.find_near_phrase(self._text, self.start)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in _RECORD_KEYS:
+            return default
+        return getattr(self, key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _RECORD_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Materialize the record, including its evidence snippet."""
+        return {key: getattr(self, key) for key in _RECORD_KEYS}
+
+    def __repr__(self) -> str:
+        return (
+            f"Candidate(value={self.value!r}, page={self.page}, span={self.span}, "
+            f"confidence={self.confidence:.3f})"
+        )
+
+
+__all__ = ["Candidate"]
@@ -0,0 +1,83 @@
+"""Cue-anchored QA context windows.
+
+Rather than passing whole pages to the QA pipeline, cut compact sub-contexts
+around cue phrases (``"by and between"``, ``"governed by"``, ...) so each
+question reads a single short window instead of several overflow strides.
+Windows are ``(start, end)`` character offsets into the page text.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from core import config
+
+Window = Tuple[int, int]
+
+
+@lru_cache(maxsize=32)
+def _cue_pattern(cues: Tuple[str, ...]) -> re.Pattern[str]:
+    # Longest first so "by and between" wins over "between" at the same offset.
+    ordered = sorted({cue.lower() for cue in cues}, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(re.escape(cue) for cue in ordered) + r")\b", re.IGNORECASE)
+
+
+def _snap_start(text: str, index: int) -> int:
+    if index <= 0:
+        return 0
+    space = text.rfind(" ", 0, index)
+    return 0 if space == -1 else space + 1
+
+
+def _snap_end(text: str, index: int) -> int:
+    if index >= len(text):
+        return len(text)
+    space = text.find(" ", index)
+    return len(text) if space == -1 else space
+
+
+def merge(windows: Iterable[Window]) -> List[Window]:
+    """Merge overlapping or touching windows into sorted, disjoint ones."""
+    merged: List[Window] = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def build(
+    text: str,
+    cues: Sequence[str],
+    before: int = config.QA_WINDOW_CHARS_BEFORE,
+    after: int = config.QA_WINDOW_CHARS_AFTER,
+) -> List[Window]:
+    """Return merged windows of ``before``/``after`` characters around each cue hit."""
+    if not text or not cues:
+        return []
+    windows = [
+        (_snap_start(text, match.start() - before), _snap_end(text, match.end() + after))
+        for match in _cue_pattern(tuple(cues)).finditer(text)
+    ]
+    return merge(windows)
+
+
+def plan(pages: Sequence[Dict[str, object]], cues: Sequence[str]) -> List[Tuple[Dict[str, object], List[Window]]]:
+    """Pair each non-empty page with the windows QA should read.
+
+    When no page in the document has a cue hit, every page is read whole so
+    documents with unusual wording still get answers.
+    """
+    planned = [
+        (page, build(str(page["text"]), cues))
+        for page in pages
+        if str(page["text"]).strip()
+    ]
+    if any(windows for _, windows in planned):
+        return [(page, windows) for page, windows in planned if windows]
+    return [(page, [(0, len(str(page["text"])))]) for page, _ in planned]
+
+
+__all__ = ["Window", "build", "merge", "plan"]
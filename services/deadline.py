@@ -0,0 +1,136 @@
+"""Cooperative per-request deadlines.
+
+A budget is bound to the current context. Page loops go through ``iterate``
+and the inference chokepoint calls ``check`` before each model call, so work
+stops between pages and model calls once time runs out. Pages that were not
+fully processed are recorded on the budget and reported as skipped.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised before a model call once the active budget has run out."""
+
+
+class Budget:
+    """Time budget for one extraction plus the pages it had to skip."""
+
+    __slots__ = ("expires_at", "skipped", "interrupted")
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+        self.skipped: Set[int] = set()
+        self.interrupted = False
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def partial(self) -> bool:
+        return self.interrupted or bool(self.skipped)
+
+    @property
+    def skipped_pages(self) -> List[int]:
+        return sorted(self.skipped)
+
+
+_BUDGET: ContextVar[Optional[Budget]] = ContextVar("extraction_budget", default=None)
+
+
+@contextmanager
+def within(seconds: Optional[float]) -> Iterator[Optional[Budget]]:
+    """Bind a budget of ``seconds`` to the enclosed block.
+
+    ``None`` keeps (and yields) any budget already active. A nested budget
+    never outlives the outer one, and its skipped pages are merged into it.
+    """
+    outer = _BUDGET.get()
+    if seconds is None:
+        yield outer
+        return
+    budget = Budget(seconds)
+    if outer is not None:
+        budget.expires_at = min(budget.expires_at, outer.expires_at)
+    token = _BUDGET.set(budget)
+    try:
+        yield budget
+    finally:
+        _BUDGET.reset(token)
+        if outer is not None:
+            outer.skipped |= budget.skipped
+            outer.interrupted = outer.interrupted or budget.interrupted
+
+
+@contextmanager
+def using(budget: Optional[Budget]) -> Iterator[Optional[Budget]]:
+    """Bind an existing ``budget`` (shared across threads or stages) to the block."""
+    token = _BUDGET.set(budget)
+    try:
+        yield budget
+    finally:
+        _BUDGET.reset(token)
+
+
+def current() -> Optional[Budget]:
+    return _BUDGET.get()
+
+
+def expired() -> bool:
+    budget = _BUDGET.get()
+    return budget is not None and budget.expired
+
+
+def skip(pages: Iterable[int]) -> None:
+    """Record ``pages`` as not (fully) processed under the active budget."""
+    budget = _BUDGET.get()
+    if budget is not None:
+        budget.skipped.update(pages)
+
+
+def check(page: Optional[int] = None) -> None:
+    """Raise ``DeadlineExceeded`` if the active budget has run out."""
+    budget = _BUDGET.get()
+    if budget is None or not budget.expired:
+        return
+    budget.interrupted = True
+    if page is not None:
+        budget.skipped.add(page)
+    raise DeadlineExceeded("Extraction deadline exceeded.")
+
+
+def _page_number(item: Any) -> int:
+    return int(item["page"])
+
+
+def iterate(items: Iterable[T], page_of: Callable[[T], int] = _page_number) -> Iterator[T]:
+    """Yield page-level work items until the budget expires; record the rest as skipped."""
+    budget = _BUDGET.get()
+    for item in items:
+        if budget is not None and budget.expired:
+            budget.skipped.add(page_of(item))
+            continue
+        yield item
+
+
+__all__ = [
+    "Budget",
+    "DeadlineExceeded",
+    "check",
+    "current",
+    "expired",
+    "iterate",
+    "skip",
+    "using",
+    "within",
+]
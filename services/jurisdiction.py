@@ -0,0 +1,207 @@
+"""Gazetteer matcher that resolves governing law without running QA."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
+from core import config
+from services.candidates import Candidate
+
+_CUE_WINDOW = 120
+_ANCHORED_CONFIDENCE = 0.9
+_CUE = "cue"
+_PLACE = "place"
+
+_US_STATES = (
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut",
+    "Delaware", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa",
+    "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan",
+    "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire",
+    "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio",
+    "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota",
+    "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington", "West Virginia",
+    "Wisconsin", "Wyoming", "District of Columbia",
+)
+
+_COUNTRIES = (
+    "Argentina", "Australia", "Austria", "Belgium", "Bermuda", "Brazil", "Canada",
+    "Cayman Islands", "Chile", "China", "Colombia", "Cyprus", "Czech Republic", "Denmark",
+    "Finland", "France", "Germany", "Greece", "Hong Kong", "Hungary", "India", "Indonesia",
+    "Ireland", "Israel", "Italy", "Japan", "Luxembourg", "Malaysia", "Malta", "Mexico",
+    "Netherlands", "New Zealand", "Norway", "Peru", "Philippines", "Poland", "Portugal",
+    "Singapore", "South Africa", "South Korea", "Spain", "Sweden", "Switzerland", "Taiwan",
+    "Thailand", "Turkey", "United Arab Emirates", "United Kingdom", "United States",
+    "Vietnam",
+)
+
+_REGIONS = (
+    "England and Wales", "England", "Scotland", "Northern Ireland", "British Virgin Islands",
+    "Guernsey", "Isle of Man", "Ontario", "Quebec", "British Columbia", "Alberta",
+    "New South Wales", "Victoria", "Queensland", "Western Australia", "Dubai",
+)
+
+_ALIASES: Dict[str, str] = {
+    "english law": "England and Wales",
+    "laws of england": "England and Wales",
+    "scots law": "Scotland",
+    "state of new york": "New York",
+    "new york law": "New York",
+    "delaware law": "Delaware",
+    "california law": "California",
+    "texas law": "Texas",
+    "german law": "Germany",
+    "french law": "France",
+    "swiss law": "Switzerland",
+    "dutch law": "Netherlands",
+    "the netherlands": "Netherlands",
+    "irish law": "Ireland",
+    "republic of ireland": "Ireland",
+    "singapore law": "Singapore",
+    "great britain": "United Kingdom",
+    "u.k.": "United Kingdom",
+    "united states of america": "United States",
+    "u.s.a.": "United States",
+    "people's republic of china": "China",
+    "prc": "China",
+    "hong kong sar": "Hong Kong",
+    "republic of korea": "South Korea",
+    "uae": "United Arab Emirates",
+    "province of ontario": "Ontario",
+    "commonwealth of massachusetts": "Massachusetts",
+    "commonwealth of pennsylvania": "Pennsylvania",
+    "commonwealth of virginia": "Virginia",
+    "commonwealth of kentucky": "Kentucky",
+    "washington, d.c.": "District of Columbia",
+}
+
+
+class _Automaton:
+    """Aho-Corasick automaton over lower-cased cue and jurisdiction phrases."""
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Dict[str, tuple[str, str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple[int, str, str]]] = [[]]
+        for phrase, payload in patterns.items():
+            state = 0
+            for char in phrase:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(phrase), payload[0], payload[1]))
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str, str]]:
+        """Yield ``(start, end, kind, value)`` for every phrase found in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, kind, value in out[state]:
+                yield index + 1 - length, index + 1, kind, value
+
+
+def _build_automaton() -> _Automaton:
+    patterns: Dict[str, tuple[str, str]] = {}
+    for name in (*_US_STATES, *_COUNTRIES, *_REGIONS):
+        patterns[name.lower()] = (_PLACE, name)
+    for alias, name in _ALIASES.items():
+        patterns[alias] = (_PLACE, name)
+    for cue in config.GOVERNING_LAW_CUES:
+        patterns.setdefault(cue.lower(), (_CUE, cue))
+    return _Automaton(patterns)
+
+
+_AUTOMATON = _build_automaton()
+_CUE_RANKS: Dict[str, int] = {cue: rank for rank, cue in enumerate(config.GOVERNING_LAW_CUES)}
+
+
+def _is_word_bounded(text: str, start: int, end: int) -> bool:
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end].isalnum():
+        return False
+    return True
+
+
+def _anchored_matches(text: str) -> List[tuple[int, int, str, int]]:
+    """Return ``(start, end, place, cue_rank)`` for places shortly after a cue."""
+    lowered = text.lower()
+    last_cue_end = -1
+    last_cue_rank = len(_CUE_RANKS)
+    matches: List[tuple[int, int, str, int]] = []
+    for start, end, kind, value in _AUTOMATON.iter_matches(lowered):
+        if kind == _CUE:
+            last_cue_end = end
+            last_cue_rank = _CUE_RANKS[value]
+            continue
+        if last_cue_end < 0 or not 0 <= start - last_cue_end <= _CUE_WINDOW:
+            continue
+        if not _is_word_bounded(lowered, start, end):
+            continue
+        if matches and start < matches[-1][1]:
+            # Overlapping phrases ("laws of England", "England and Wales"): keep the longer.
+            if end - start <= matches[-1][1] - matches[-1][0]:
+                continue
+            matches.pop()
+        matches.append((start, end, value, last_cue_rank))
+    return matches
+
+
+def locate(value: str) -> Optional[tuple[int, int, str]]:
+    """Return ``(start, end, canonical)`` for the first jurisdiction in ``value``."""
+    lowered = value.lower()
+    found: Optional[tuple[int, int, str]] = None
+    for start, end, kind, name in _AUTOMATON.iter_matches(lowered):
+        if kind != _PLACE or not _is_word_bounded(lowered, start, end):
+            continue
+        if found is None or (start, start - end) < (found[0], found[0] - found[1]):
+            found = (start, end, name)
+    return found
+
+
+def normalize(value: str) -> Optional[str]:
+    """Return the canonical jurisdiction mentioned in ``value``, if any."""
+    found = locate(value)
+    return found[2] if found else None
+
+
+def find_governing_law(pages: List[Dict[str, object]]) -> Optional[Candidate]:
+    """Return the cue-anchored jurisdiction across ``pages`` in record shape.
+
+    The strongest cue wins (``GOVERNING_LAW_CUES`` order), so a governing-law
+    clause late in the document beats a weaker cue on an earlier page; ties go
+    to the earliest page and offset.
+    """
+    best: Optional[tuple[tuple[int, int, int, int], Dict[str, object], int, int, str]] = None
+    for order, page in enumerate(pages):
+        for start, end, value, rank in _anchored_matches(str(page["text"])):
+            key = (rank, order, start, start - end)
+            if best is None or key < best[0]:
+                best = (key, page, start, end, value)
+    if best is None:
+        return None
+    _, page, start, end, value = best
+    return Candidate(value, int(page["page"]), [start, end], _ANCHORED_CONFIDENCE, str(page["text"]))
+
+
+__all__ = ["find_governing_law", "locate", "normalize"]
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+from typing import List
 
-from core import config, model
+from core import config
+from services import deadline, inference, profiling
+from services.candidates import Candidate
 
 _WINDOW_AFTER_BETWEEN = 240
 _DEFAULT_WINDOW = 800
@@ -32,19 +34,16 @@ def _boost_score(name: str, base: float) -> float:
     return base
 
 
-def _normalize(name: str) -> str:
-    return re.sub(r"[^a-z0-9]", "", name.lower())
-
-
-def find_parties(text: str) -> List[Dict[str, object]]:
-    """Return up to two likely party names from contract text."""
-    ner = model.get_ner()
-    candidates: dict[str, Dict[str, object]] = {}
+def _collect_candidates(text: str, page: int) -> dict[str, Candidate]:
+    candidates: dict[str, Candidate] = {}
     for offset, segment in _segment_text(text):
+        if deadline.expired():
+            deadline.skip([page])
+            break
         if not segment.strip():
             continue
         try:
-            results = ner(segment)
+            results = inference.ner(text, offset, offset + len(segment), page=page)
         except Exception:
             continue
         for entity in results:
@@ -54,22 +53,24 @@ def find_parties(text: str) -> List[Dict[str, object]]:
             value = segment[entity["start"] : entity["end"]].strip()
             if not value:
                 continue
-            norm = _normalize(value)
-            if not norm:
-                continue
             if value.lower() in config.ROLE_STOPWORDS:
                 continue
             start = offset + int(entity["start"])
             end = offset + int(entity["end"])
             confidence = float(entity.get("score", 0.0))
-            confidence = _boost_score(value, confidence)
-            record = {
-                "value": value,
-                "span": [start, end],
-                "confidence": confidence,
-            }
+            record = Candidate(value, page, [start, end], _boost_score(value, confidence), text)
+            norm = record.norm
+            if not norm:
+                continue
             stored = candidates.get(norm)
-            if stored is None or record["confidence"] > stored["confidence"]:
+            if stored is None or record.confidence > stored.confidence:
                 candidates[norm] = record
-    ordered = sorted(candidates.values(), key=lambda item: (-item["confidence"], item["span"][0]))
+    return candidates
+
+
+def find_parties(text: str, page: int = 0) -> List[Candidate]:
+    """Return up to two likely party names from contract text."""
+    with profiling.span("find_parties", page=page):
+        candidates = _collect_candidates(text, page)
+    ordered = sorted(candidates.values(), key=lambda item: (-item.confidence, item.start))
     return ordered[:2]
@@ -0,0 +1,156 @@
+"""Split multi-contract PDF packets into sub-documents and extract each one.
+
+Page text arrives without line breaks (sanitization strips them, sometimes
+joining words), so boundaries are scored from substring signals:
+
+* a title in capitals at the top of the page (``AMENDMENT NO. 1 ...``),
+* a preamble cue near the top (``"by and between"``, ``"entered into by"``),
+* a signature block at the end of the previous page,
+* a page-number reset (``Page 1 of 4`` after ``Page 7 of 7``).
+
+A page opens a new sub-document when its score reaches
+``PACKET_BOUNDARY_THRESHOLD``, so a single weak signal, such as an all-caps
+heading mid-contract, does not split a document. Pages headed as attachments
+(``EXHIBIT A``, ``SCHEDULE 2``, ...) never open one: they stay with the
+agreement they follow.
+"""
+from __future__ import annotations
+
+import contextvars
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Collection, Dict, List, Optional
+
+from core import config
+from services import deadline, inference, qa_extract
+
+_SIGNAL_WEIGHTS = {"title": 2, "preamble": 2, "page_reset": 2, "signature": 1}
+_TAIL_CHARS = 400
+_TITLE_PATTERN = re.compile(
+    r"^\W*(?:[A-Z0-9][A-Z0-9&.,'/\-]*\s+){0,8}?(?:"
+    + "|".join(re.escape(term) for term in config.PACKET_TITLE_TERMS)
+    + r")(?![a-z])"
+)
+_ATTACHMENT_PATTERN = re.compile(
+    r"^\W*(?:" + "|".join(re.escape(term) for term in config.PACKET_ATTACHMENT_TERMS) + r")\b"
+)
+_PAGE_LABEL_PATTERN = re.compile(r"(?:Page\s*(\d+)(?:\s*of\s*\d+)?|-\s*(\d+)\s*-)\s*$", re.IGNORECASE)
+_STRONG_SIGNATURE_CUE = "in witness whereof"
+
+
+def _page_label(text: str) -> Optional[int]:
+    match = _PAGE_LABEL_PATTERN.search(text[-40:])
+    if match is None:
+        return None
+    return int(match.group(1) or match.group(2))
+
+
+def _has_signature_block(text: str) -> bool:
+    tail = text[-_TAIL_CHARS:].lower()
+    if _STRONG_SIGNATURE_CUE in tail:
+        return True
+    return sum(cue in tail for cue in config.PACKET_SIGNATURE_CUES) >= 2
+
+
+def _signals(previous: Dict[str, object], page: Dict[str, object]) -> List[str]:
+    text = str(page["text"])
+    if _ATTACHMENT_PATTERN.match(text):
+        # "EXHIBIT A STATEMENT OF WORK" after the signature page belongs to the contract.
+        return []
+    head = text[: config.PACKET_PREAMBLE_CHARS].lower()
+    signals: List[str] = []
+    if _TITLE_PATTERN.match(text):
+        signals.append("title")
+    if any(cue in head for cue in config.PACKET_PREAMBLE_CUES):
+        signals.append("preamble")
+    if _has_signature_block(str(previous["text"])):
+        signals.append("signature")
+    previous_label = _page_label(str(previous["text"]))
+    if previous_label is not None and _page_label(text) == 1:
+        signals.append("page_reset")
+    return signals
+
+
+def detect_boundaries(pages: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Return the pages that open a sub-document, with the signals that fired.
+
+    The first page always opens the first sub-document.
+    """
+    if not pages:
+        return []
+    boundaries: List[Dict[str, object]] = [{"page": int(pages[0]["page"]), "signals": []}]
+    for previous, page in zip(pages, pages[1:]):
+        signals = _signals(previous, page)
+        if sum(_SIGNAL_WEIGHTS[signal] for signal in signals) >= config.PACKET_BOUNDARY_THRESHOLD:
+            boundaries.append({"page": int(page["page"]), "signals": signals})
+    return boundaries
+
+
+def split_packet(pages: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Group ``pages`` into sub-documents: ``{start_page, end_page, signals, pages}``."""
+    boundaries = detect_boundaries(pages)
+    starts = {int(boundary["page"]): boundary["signals"] for boundary in boundaries}
+    documents: List[Dict[str, object]] = []
+    for page in pages:
+        number = int(page["page"])
+        if number in starts:
+            documents.append({"start_page": number, "signals": starts[number], "pages": []})
+        documents[-1]["pages"].append(page)
+        documents[-1]["end_page"] = number
+    return documents
+
+
+def _extract_document(
+    pages: List[Dict[str, object]], fields: Collection[str], deadline_seconds: Optional[float]
+) -> Dict[str, object]:
+    # Record outputs per document, as workers.extract_document does, so the
+    # deadline's whole-document pass replays the preamble instead of recomputing it.
+    with inference.recording():
+        return qa_extract.extract_fields(pages, fields, deadline_seconds)
+
+
+def extract_packet(
+    pages: List[Dict[str, object]],
+    fields: Optional[Collection[str]] = None,
+    max_workers: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+) -> List[Dict[str, object]]:
+    """Split ``pages`` and extract each sub-document concurrently.
+
+    Each result carries ``start_page``, ``end_page``, ``signals`` and the
+    ``extraction`` mapping returned by ``qa_extract.extract_fields``. One
+    ``deadline_seconds`` budget covers the whole packet.
+    """
+    wanted = qa_extract.resolve_fields(fields)
+    documents = split_packet(pages)
+    if not documents:
+        return []
+    workers = max(1, min(len(documents), max_workers or config.MODEL_POOL_SIZE))
+    with deadline.within(deadline_seconds), ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="packet"
+    ) as executor:
+        # Each task gets a copy of the caller's context (profiling session, deadline)
+        # and its own nested budget, so skipped pages are reported per document.
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                _extract_document,
+                document["pages"],
+                wanted,
+                deadline_seconds,
+            )
+            for document in documents
+        ]
+        extractions = [future.result() for future in futures]
+    return [
+        {
+            "start_page": document["start_page"],
+            "end_page": document["end_page"],
+            "signals": document["signals"],
+            "extraction": extraction,
+        }
+        for document, extraction in zip(documents, extractions)
+    ]
+
+
+__all__ = ["detect_boundaries", "extract_packet", "split_packet"]
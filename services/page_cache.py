@@ -0,0 +1,248 @@
+"""Persistent cross-document cache of raw QA/NER outputs keyed by page fingerprint.
+
+Pages are fingerprinted by the hash of their whitespace-normalized text, so a
+copy that differs only in spacing or line wrapping still hits. Offsets are
+stored in normalized coordinates and mapped back onto the page being read;
+QA answer strings are dropped (callers rebuild them from the page), so
+entries hold offsets, scores and entity labels but no document text.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core import config, model, utils
+
+_SCHEMA_VERSION = 2
+_EVICTION_SLACK = 0.9
+_TOKEN = re.compile(r"\S+")
+# Next LRU tick, read under the write lock so processes sharing the file never collide.
+_NEXT_TICK = "SELECT COALESCE(MAX(last_used), 0) + 1 FROM page_outputs"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_outputs (
+    page_sha256 TEXT NOT NULL,
+    call_key TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    output TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (page_sha256, call_key, model_version)
+);
+CREATE INDEX IF NOT EXISTS idx_page_outputs_last_used ON page_outputs (last_used);
+"""
+
+
+class Fingerprint:
+    """Whitespace-normalized view of one page with offset maps to its raw text."""
+
+    __slots__ = ("text", "digest", "_positions")
+
+    def __init__(self, text: str) -> None:
+        normalized: List[str] = []
+        positions: List[int] = []
+        for match in _TOKEN.finditer(text):
+            if normalized:
+                normalized.append(" ")
+                positions.append(match.start() - 1)
+            normalized.append(match.group())
+            positions.extend(range(match.start(), match.end()))
+        self.text = "".join(normalized)
+        self.digest = utils.sha256_bytes(self.text.encode("utf-8"))
+        self._positions = positions
+
+    def to_normalized(self, index: int) -> int:
+        return bisect.bisect_left(self._positions, index)
+
+    def _start_to_raw(self, index: int, length: int) -> int:
+        return self._positions[index] if index < len(self._positions) else length
+
+    def _end_to_raw(self, index: int) -> int:
+        return self._positions[index - 1] + 1 if index > 0 else 0
+
+    def call_key(self, base: str, window: Tuple[int, int]) -> str:
+        """Cache key for a call reading ``window`` of the raw page."""
+        start, stop = (self.to_normalized(bound) for bound in window)
+        return base if (start, stop) == (0, len(self.text)) else f"{base}|{start}:{stop}"
+
+    def store(self, output: Any, window: Tuple[int, int], offsets_from_window: bool) -> Any:
+        """Convert raw-page ``output`` to normalized offsets without answer text."""
+        base = window[0] if offsets_from_window else 0
+        shift = self.to_normalized(base) if offsets_from_window else 0
+
+        def convert(start: int, end: int) -> Tuple[int, int]:
+            return self.to_normalized(base + start) - shift, self.to_normalized(base + end) - shift
+
+        return _map_offsets(output, convert, drop_answer=True)
+
+    def load(self, text: str, output: Any, window: Tuple[int, int], offsets_from_window: bool) -> Any:
+        """Map a stored ``output`` back onto the raw ``text`` this fingerprint was built from.
+
+        QA answers are left for the caller to rebuild from ``text``.
+        """
+        base = window[0] if offsets_from_window else 0
+        shift = self.to_normalized(base) if offsets_from_window else 0
+
+        def convert(start: int, end: int) -> Tuple[int, int]:
+            raw_start = self._start_to_raw(start + shift, len(text)) - base
+            return raw_start, max(raw_start, self._end_to_raw(end + shift) - base)
+
+        return _map_offsets(output, convert, drop_answer=False)
+
+
+def _map_offsets(output: Any, convert: Callable[[int, int], Tuple[int, int]], drop_answer: bool) -> Any:
+    if isinstance(output, list):
+        return [_map_offsets(item, convert, drop_answer) for item in output]
+    if isinstance(output, dict) and isinstance(output.get("start"), int) and isinstance(output.get("end"), int):
+        start, end = convert(output["start"], output["end"])
+        return {
+            **{key: value for key, value in output.items() if not (drop_answer and key == "answer")},
+            "start": start,
+            "end": end,
+        }
+    return output
+
+
+@lru_cache(maxsize=256)
+def fingerprint(text: str) -> Fingerprint:
+    """Return the (memoized) normalized fingerprint of a page."""
+    return Fingerprint(text)
+
+
+class PageCache:
+    """SQLite-backed LRU cache of model outputs for page-level inference calls.
+
+    Worker processes share one cache file, so the LRU clock and entry count
+    are read from the database inside each write rather than kept in memory.
+    """
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, page_sha256: str, call_key: str, model_version: str) -> Optional[Any]:
+        key = (page_sha256, call_key, model_version)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM page_outputs WHERE page_sha256 = ? AND call_key = ? AND model_version = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                f"UPDATE page_outputs SET last_used = ({_NEXT_TICK}) "
+                "WHERE page_sha256 = ? AND call_key = ? AND model_version = ?",
+                key,
+            )
+        return json.loads(row[0])
+
+    def put(self, page_sha256: str, call_key: str, model_version: str, output: Any) -> None:
+        payload = json.dumps(output, ensure_ascii=True)
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so the tick and count below
+            # cannot interleave with another process's insert.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    f"INSERT OR IGNORE INTO page_outputs VALUES (?, ?, ?, ?, ({_NEXT_TICK}))",
+                    (page_sha256, call_key, model_version, payload),
+                )
+                if cursor.rowcount:
+                    entries = self._count()
+                    if entries > self.max_entries:
+                        self._evict(entries)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _count(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM page_outputs").fetchone()[0])
+
+    def _evict(self, entries: int) -> None:
+        # Trim below the cap so eviction runs once per batch of inserts, not per insert.
+        excess = entries - int(self.max_entries * _EVICTION_SLACK)
+        cursor = self._conn.execute(
+            "DELETE FROM page_outputs WHERE rowid IN "
+            "(SELECT rowid FROM page_outputs ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        self.evictions += cursor.rowcount
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            entries = self._count()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CACHE: Optional[PageCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def model_version(kind: str) -> str:
+    """Return the cache namespace for the ``qa`` or ``ner`` model currently loaded.
+
+    The revision is the resolved commit, so an upstream update to a floating
+    ref like ``main`` starts a fresh namespace instead of serving stale outputs.
+    """
+    name = config.QA_MODEL_NAME if kind == "qa" else config.NER_MODEL_NAME
+    return f"{name}@{model.revision(kind)}#v{_SCHEMA_VERSION}"
+
+
+def get_cache() -> Optional[PageCache]:
+    """Return the process-wide cache for ``config.PAGE_CACHE_PATH``, if enabled."""
+    global _CACHE
+    if not config.PAGE_CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE.path != config.PAGE_CACHE_PATH:
+            if _CACHE is not None:
+                _CACHE.close()
+            _CACHE = PageCache(config.PAGE_CACHE_PATH, config.PAGE_CACHE_MAX_ENTRIES)
+        return _CACHE
+
+
+def stats() -> Dict[str, object]:
+    """Return hit-rate statistics, or ``{"enabled": False}`` when the cache is off."""
+    cache = get_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+def reset() -> None:
+    """Close the process-wide cache; primarily useful for tests."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is not None:
+            _CACHE.close()
+        _CACHE = None
+
+
+__all__ = ["Fingerprint", "PageCache", "fingerprint", "get_cache", "model_version", "reset", "stats"]
@@ -3,25 +3,95 @@ from __future__ import annotations
 
 import io
 import re
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional
 
 import pdfplumber
 
+from core import config
+from services import deadline
+
 _CONTROL_CHAR_PATTERN = re.compile(r"[\u0000-\u001f\u007f]")
 
+PageTextBackend = Callable[[bytes], Iterator[str]]
+"""Yields the raw text of each page, in order; sanitization happens in ``extract_pages``."""
+
 
 def _sanitize_text(text: str) -> str:
     cleaned = _CONTROL_CHAR_PATTERN.sub("", text)
     return cleaned.strip()
 
 
-def extract_pages(pdf_bytes: bytes) -> List[Dict[str, object]]:
-    """Extract textual content from each page of a digital PDF."""
-    pages: List[Dict[str, object]] = []
+def _pdfplumber_pages(pdf_bytes: bytes) -> Iterator[str]:
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+
+
+def _pypdfium2_pages(pdf_bytes: bytes) -> Iterator[str]:
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(pdf_bytes)
+    try:
+        for index in range(len(document)):
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        document.close()
+
+
+def _pdfplumber_count(pdf_bytes: bytes) -> int:
     with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-        for page_number, page in enumerate(pdf.pages, start=1):
-            raw_text = page.extract_text() or ""
-            text = _sanitize_text(raw_text)
-            if text:
-                pages.append({"page": page_number, "text": text})
+        return len(pdf.pages)
+
+
+def _pypdfium2_count(pdf_bytes: bytes) -> int:
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(pdf_bytes)
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+BACKENDS: Dict[str, PageTextBackend] = {
+    "pdfplumber": _pdfplumber_pages,
+    "pypdfium2": _pypdfium2_pages,
+}
+_PAGE_COUNTERS: Dict[str, Callable[[bytes], int]] = {
+    "pdfplumber": _pdfplumber_count,
+    "pypdfium2": _pypdfium2_count,
+}
+
+
+def get_backend(name: Optional[str] = None) -> PageTextBackend:
+    """Return the page text backend ``name`` (defaults to ``config.PDF_TEXT_BACKEND``)."""
+    backend_name = name or config.PDF_TEXT_BACKEND
+    try:
+        return BACKENDS[backend_name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF text backend: {backend_name}") from None
+
+
+def extract_pages(pdf_bytes: bytes, backend: Optional[str] = None) -> List[Dict[str, object]]:
+    """Extract textual content from each page of a digital PDF.
+
+    Under an active deadline, parsing stops between pages and the pages left
+    unread are recorded as skipped.
+    """
+    pages: List[Dict[str, object]] = []
+    for page_number, raw_text in enumerate(get_backend(backend)(pdf_bytes), start=1):
+        text = _sanitize_text(raw_text or "")
+        if text:
+            pages.append({"page": page_number, "text": text})
+        if deadline.expired():
+            counter = _PAGE_COUNTERS.get(backend or config.PDF_TEXT_BACKEND)
+            if counter is not None:
+                deadline.skip(range(page_number + 1, counter(pdf_bytes) + 1))
+            break
     return pages
@@ -0,0 +1,177 @@
+"""Opt-in per-request profiling with span annotations for model calls.
+
+Profiles are stored under the file hash plus a per-run id, so repeated
+profiled requests for one contract keep separate outputs, and contain only
+function statistics and span metadata (stage, page number, question), never
+document text. Runs older than ``PROFILE_RETENTION_DAYS`` are purged.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from core import config, utils
+
+_TRUTHY = {"1", "true", "yes", "on"}
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+_RUN_ID = re.compile(r"[0-9a-f]{20}")
+
+
+class ProfileSession:
+    """Collects a cProfile profile and timed spans for one request."""
+
+    __slots__ = ("file_hash", "run_id", "profiler", "spans", "_origin")
+
+    def __init__(self, file_hash: str, run_id: Optional[str] = None) -> None:
+        self.file_hash = file_hash
+        self.run_id = run_id or new_run_id()
+        self.profiler = cProfile.Profile()
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+
+
+_SESSION: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def is_requested(headers: Mapping[str, str], query: Mapping[str, str]) -> bool:
+    """Return True when profiling is enabled and the request opts in."""
+    if not config.PROFILING_ENABLED:
+        return False
+    flag = headers.get(PROFILE_HEADER) or query.get(PROFILE_QUERY_PARAM) or ""
+    return flag.strip().lower() in _TRUTHY
+
+
+def new_run_id() -> str:
+    """Return a run id that sorts by start time; the random tail keeps concurrent runs apart."""
+    return f"{time.time_ns() // 1_000_000:012x}{secrets.token_hex(4)}"
+
+
+def runs(file_hash: str) -> List[str]:
+    """Return the stored run ids for ``file_hash``, oldest first."""
+    if not utils.is_sha256(file_hash):
+        return []
+    paths = Path(config.PROFILE_DIR).glob(f"{file_hash}.*.prof")
+    found = (path.name[len(file_hash) + 1 : -len(".prof")] for path in paths)
+    return sorted(run_id for run_id in found if _RUN_ID.fullmatch(run_id))
+
+
+def _run_path(file_hash: str, run_id: Optional[str], suffix: str) -> Optional[Path]:
+    if not utils.is_sha256(file_hash):
+        return None
+    if run_id is None:
+        stored = runs(file_hash)
+        if not stored:
+            return None
+        run_id = stored[-1]
+    if not _RUN_ID.fullmatch(run_id):
+        return None
+    return Path(config.PROFILE_DIR) / f"{file_hash}.{run_id}{suffix}"
+
+
+def profile_path(file_hash: str, run_id: Optional[str] = None) -> Optional[Path]:
+    """Path of the cProfile stats for one run; the latest run when ``run_id`` is omitted."""
+    return _run_path(file_hash, run_id, ".prof")
+
+
+def spans_path(file_hash: str, run_id: Optional[str] = None) -> Optional[Path]:
+    """Path of the span annotations for one run; the latest run when ``run_id`` is omitted."""
+    return _run_path(file_hash, run_id, ".spans.json")
+
+
+def _save(session: ProfileSession) -> None:
+    prof_path = profile_path(session.file_hash, session.run_id)
+    span_path = spans_path(session.file_hash, session.run_id)
+    if prof_path is None or span_path is None:
+        return
+    prof_path.parent.mkdir(parents=True, exist_ok=True)
+    # Spans first: a run is listed once its .prof exists, so both files are there by then.
+    with span_path.open("w", encoding="utf-8") as handle:
+        json.dump(
+            {"file_sha256": session.file_hash, "run": session.run_id, "spans": session.spans},
+            handle,
+            ensure_ascii=True,
+        )
+    session.profiler.dump_stats(str(prof_path))
+
+
+def purge(now: Optional[float] = None) -> int:
+    """Delete profile files older than ``PROFILE_RETENTION_DAYS``; return how many went."""
+    if config.PROFILE_RETENTION_DAYS <= 0:
+        return 0
+    root = Path(config.PROFILE_DIR)
+    if not root.is_dir():
+        return 0
+    cutoff = (time.time() if now is None else now) - config.PROFILE_RETENTION_DAYS * 86400
+    removed = 0
+    for path in [*root.glob("*.prof"), *root.glob("*.spans.json")]:
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+@contextmanager
+def session(
+    file_hash: str, enabled: bool = True, run_id: Optional[str] = None
+) -> Iterator[Optional[ProfileSession]]:
+    """Profile the enclosed block for ``file_hash``; a no-op when not ``enabled``."""
+    if not enabled:
+        yield None
+        return
+    active = ProfileSession(file_hash, run_id)
+    token = _SESSION.set(active)
+    active.profiler.enable()
+    try:
+        yield active
+    finally:
+        active.profiler.disable()
+        _SESSION.reset(token)
+        _save(active)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block as a span; callers may add attributes to the yielded dict."""
+    active = _SESSION.get()
+    if active is None:
+        yield attrs
+        return
+    started = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        ended = time.perf_counter()
+        active.spans.append(
+            {
+                "name": name,
+                **attrs,
+                "start_ms": round((started - active._origin) * 1000, 3),
+                "duration_ms": round((ended - started) * 1000, 3),
+            }
+        )
+
+
+__all__ = [
+    "PROFILE_HEADER",
+    "PROFILE_QUERY_PARAM",
+    "ProfileSession",
+    "is_requested",
+    "new_run_id",
+    "profile_path",
+    "purge",
+    "runs",
+    "session",
+    "span",
+    "spans_path",
+]
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Optional
+from typing import Any, Collection, Dict, FrozenSet, List, Optional
 
-from core import config, model, utils
-from services import ner_fallback
+from core import config
+from services import context_windows, deadline, inference, jurisdiction, ner_fallback
+from services.candidates import Candidate
 
 _ROLE_KEYWORDS = {word.lower() for word in config.ROLE_STOPWORDS}
 _PARTY_EXCLUSIONS = {word.lower() for word in config.PARTY_EXCLUSION_TERMS}
@@ -24,6 +25,23 @@ _QA_QUESTIONS = {
     "governing_law": "What law governs the agreement?",
 }
 
+FIELDS = ("parties", "effective_date", "agreement_date", "governing_law")
+_FIELD_ALIASES = {"party_a": "parties", "party_b": "parties"}
+# Field groups in run order, cheapest first: the gazetteer usually resolves
+# governing law without a model call. Dates share a stage for the tie-break.
+STAGES: tuple[FrozenSet[str], ...] = (
+    frozenset({"governing_law"}),
+    frozenset({"effective_date", "agreement_date"}),
+    frozenset({"parties"}),
+)
+
+_FIELD_CUES = {
+    "parties": config.PARTY_KEYWORDS,
+    "effective_date": config.EFFECTIVE_DATE_KEYWORDS,
+    "agreement_date": config.AGREEMENT_DATE_KEYWORDS + config.AGREEMENT_DATE_CUES,
+    "governing_law": config.GOVERNING_LAW_CUES,
+}
+
 
 def _locate_span(context: str, answer: str) -> Optional[List[int]]:
     if not answer:
@@ -39,46 +57,73 @@ def _locate_span(context: str, answer: str) -> Optional[List[int]]:
     return None
 
 
-def _build_evidence(text: str, span: Optional[List[int]]) -> Optional[str]:
-    if span is None:
-        return None
-    return utils.find_near_phrase(text, span[0])
+def _answer_span(text: str, answer: Dict[str, object]) -> Optional[List[int]]:
+    """Page span of a QA answer, preferring the offsets reported by the pipeline."""
+    value = str(answer.get("answer") or "").strip()
+    start, end = answer.get("start"), answer.get("end")
+    if value and isinstance(start, int) and isinstance(end, int):
+        offset = text.find(value, start, end)
+        if offset != -1:
+            return [offset, offset + len(value)]
+    return _locate_span(text, value)
 
 
-def _dedupe_entities(entities: List[Dict[str, object]]) -> List[Dict[str, object]]:
-    seen: dict[str, Dict[str, object]] = {}
-    for entity in entities:
-        value = (entity.get("value") or "").strip()
-        if not value:
+def _ask(
+    page: Dict[str, object],
+    windows: List[context_windows.Window],
+    question: str,
+    top_k: Optional[int] = None,
+) -> Any:
+    """Ask ``question`` over each window of ``page``; best answer, or merged top-k list."""
+    text = str(page["text"])
+    answers: List[Dict[str, object]] = []
+    for start, end in windows:
+        try:
+            result = inference.qa(text, question, top_k=top_k, page=int(page["page"]), start=start, end=end)
+        except Exception:
             continue
-        norm = re.sub(r"[^a-z0-9]", "", value.lower())
+        answers.extend(result if isinstance(result, list) else [result])
+    answers.sort(key=lambda item: float(item.get("score", 0.0)), reverse=True)
+    if top_k:
+        return answers[:top_k]
+    return answers[0] if answers else {}
+
+
+def _planned_page(item: tuple) -> int:
+    return int(item[0]["page"])
+
+
+def _dedupe_entities(entities: List[Candidate]) -> List[Candidate]:
+    seen: dict[str, Candidate] = {}
+    for entity in entities:
+        norm = entity.norm
         if not norm:
             continue
         stored = seen.get(norm)
-        if stored is None or float(entity.get("confidence", 0.0)) > float(stored.get("confidence", 0.0)):
+        if stored is None or entity.confidence > stored.confidence:
             seen[norm] = entity
-    return sorted(seen.values(), key=lambda item: (-float(item.get("confidence", 0.0)), item.get("page", 0)))
+    return sorted(seen.values(), key=lambda item: (-item.confidence, item.page))
 
 
 def _collect_parties_from_answer(
     page: Dict[str, object],
     answer: str,
     score: float,
-    extra_answers: Optional[List[str]] = None,
-) -> List[Dict[str, object]]:
+    extra_answers: Optional[List[Dict[str, object]]] = None,
+    span: Optional[List[int]] = None,
+) -> List[Candidate]:
     text = str(page["text"])
     page_number = int(page["page"])
-    span = _locate_span(text, answer)
+    span = span or _locate_span(text, answer)
     snippet_start = (span[0] if span else text.find(answer))
     if snippet_start == -1:
         snippet_start = 0
     window_start = max(0, snippet_start - 200)
     window_end = min(len(text), (span[1] if span else snippet_start + len(answer)) + 200)
     snippet = text[window_start:window_end]
-    ner = model.get_ner()
-    candidates: List[Dict[str, object]] = []
+    candidates: List[Candidate] = []
     try:
-        ner_results = ner(snippet)
+        ner_results = inference.ner(text, window_start, window_end, page=page_number)
     except Exception:
         ner_results = []
     for entity in ner_results:
@@ -100,25 +145,16 @@ def _collect_parties_from_answer(
         if hints:
             adjusted_conf = max(adjusted_conf, confidence + 0.1)
         candidates.append(
-            {
-                "value": value,
-                "page": page_number,
-                "span": [start, end],
-                "confidence": min(max(adjusted_conf, _MIN_PARTY_CONFIDENCE), _MAX_PARTY_CONFIDENCE),
-                "evidence": _build_evidence(text, [start, end]),
-            }
+            Candidate(
+                value,
+                page_number,
+                [start, end],
+                min(max(adjusted_conf, _MIN_PARTY_CONFIDENCE), _MAX_PARTY_CONFIDENCE),
+                text,
+            )
         )
     if not candidates and answer:
-        span = _locate_span(text, answer)
-        candidates.append(
-            {
-                "value": answer.strip(),
-                "page": page_number,
-                "span": span,
-                "confidence": score,
-                "evidence": _build_evidence(text, span),
-            }
-        )
+        candidates.append(Candidate(answer.strip(), page_number, span, score, text))
     role_pattern = re.compile(
         r"([A-Z][A-Za-z&.,'\-]*(?:\s+[A-Z0-9][A-Za-z&.,'\-]*){1,5})\s*\((?:the\s+)?(transporter|shipper|seller|buyer|licensor|licensee|borrower|lender)\)",
         re.IGNORECASE,
@@ -145,60 +181,37 @@ def _collect_parties_from_answer(
             continue
         start = window_start + match.start(1)
         end = window_start + match.end(1)
-        candidates.append(
-            {
-                "value": value,
-                "page": page_number,
-                "span": [start, end],
-                "confidence": max(score, 0.4),
-                "evidence": _build_evidence(text, [start, end]),
-            }
-        )
+        candidates.append(Candidate(value, page_number, [start, end], max(score, 0.4), text))
     if extra_answers:
         for alt in extra_answers:
-            alt = (alt or "").strip()
-            if not alt:
-                continue
-            alt_span = _locate_span(text, alt)
+            alt_span = _answer_span(text, alt)
             if not alt_span:
                 continue
             alt_value = text[alt_span[0] : alt_span[1]].strip()
             if alt_value.lower() in _ROLE_KEYWORDS:
                 continue
             candidates.append(
-                {
-                    "value": alt_value,
-                    "page": page_number,
-                    "span": alt_span,
-                    "confidence": max(score - 0.05, _MIN_PARTY_CONFIDENCE),
-                    "evidence": _build_evidence(text, alt_span),
-                }
+                Candidate(
+                    alt_value,
+                    page_number,
+                    alt_span,
+                    max(score - 0.05, _MIN_PARTY_CONFIDENCE),
+                    text,
+                )
             )
     return candidates
 
 
-def _fallback_parties(pages: List[Dict[str, object]]) -> List[Dict[str, object]]:
-    fallback: List[Dict[str, object]] = []
-    for page in pages:
-        text = str(page["text"])
-        page_number = int(page["page"])
-        for candidate in ner_fallback.find_parties(text):
-            span = candidate.get("span")
-            fallback.append(
-                {
-                    "value": candidate.get("value"),
-                    "page": page_number,
-                    "span": span if span else None,
-                    "confidence": float(candidate.get("confidence", 0.35)),
-                    "evidence": _build_evidence(text, span if span else None),
-                }
-            )
+def _fallback_parties(pages: List[Dict[str, object]]) -> List[Candidate]:
+    fallback: List[Candidate] = []
+    for page in deadline.iterate(pages):
+        fallback.extend(ner_fallback.find_parties(str(page["text"]), page=int(page["page"])))
     return fallback
 
 
 def _keyword_search_date(
     pages: List[Dict[str, object]], keywords: tuple[str, ...]
-) -> Optional[Dict[str, object]]:
+) -> Optional[Candidate]:
     for page in pages:
         text = str(page["text"])
         lowered = text.lower()
@@ -213,32 +226,20 @@ def _keyword_search_date(
                     start = window_start + date_match.start()
                     end = window_start + date_match.end()
                     value = window[date_match.start() : date_match.end()].strip()
-                    return {
-                        "value": value,
-                        "page": page_number,
-                        "span": [start, end],
-                        "confidence": 0.4,
-                        "evidence": _build_evidence(text, [start, end]),
-                    }
+                    return Candidate(value, page_number, [start, end], 0.4, text)
     for page in pages:
         text = str(page["text"])
         page_number = int(page["page"])
         match = config.DATE_PATTERN.search(text)
         if match:
             start, end = match.start(), match.end()
-            return {
-                "value": match.group(0).strip(),
-                "page": page_number,
-                "span": [start, end],
-                "confidence": 0.3,
-                "evidence": _build_evidence(text, [start, end]),
-            }
+            return Candidate(match.group(0).strip(), page_number, [start, end], 0.3, text)
     return None
 
 
 def _find_contextual_date(
     pages: List[Dict[str, object]], cues: tuple[str, ...], exclude_span: Optional[List[int]] = None
-) -> Optional[Dict[str, object]]:
+) -> Optional[Candidate]:
     lowered_cues = tuple(cue.lower() for cue in cues)
     for page in pages:
         text = str(page["text"])
@@ -251,44 +252,26 @@ def _find_contextual_date(
             window = lowered[max(0, start - 60) : start]
             if any(cue in window for cue in lowered_cues):
                 value = match.group(0).strip()
-                return {
-                    "value": value,
-                    "page": int(page["page"]),
-                    "span": span,
-                    "confidence": 0.45,
-                    "evidence": _build_evidence(text, span),
-                }
+                return Candidate(value, int(page["page"]), span, 0.45, text)
     return None
 
 
-def _extract_simple_field(field: str, pages: List[Dict[str, object]]) -> Optional[Dict[str, object]]:
-    qa = model.get_qa()
+def _extract_simple_field(field: str, pages: List[Dict[str, object]]) -> Optional[Candidate]:
     question = _QA_QUESTIONS[field]
-    best: Optional[Dict[str, object]] = None
-    for page in pages:
+    best: Optional[Candidate] = None
+    planned = context_windows.plan(pages, _FIELD_CUES[field])
+    for page, windows in deadline.iterate(planned, _planned_page):
         text = str(page["text"])
-        if not text.strip():
-            continue
-        try:
-            answer = qa(question=question, context=text)
-        except Exception:
-            continue
+        answer = _ask(page, windows, question)
         score = float(answer.get("score", 0.0))
         if score < config.QA_SCORE_THRESHOLD:
             continue
         value = (answer.get("answer") or "").strip()
         if not value:
             continue
-        span = _locate_span(text, value)
-        record = {
-            "value": value,
-            "page": int(page["page"]),
-            "span": span,
-            "confidence": score,
-            "evidence": _build_evidence(text, span),
-        }
-        if best is None or score > best["confidence"]:
-            best = record
+        span = _answer_span(text, answer)
+        if best is None or score > best.confidence:
+            best = Candidate(value, int(page["page"]), span, score, text)
     return best
 
 
@@ -296,88 +279,61 @@ def _extract_date_field(
     field: str,
     pages: List[Dict[str, object]],
     keywords: tuple[str, ...],
-) -> Optional[Dict[str, object]]:
-    qa = model.get_qa()
-    best: Optional[Dict[str, object]] = None
+) -> Optional[Candidate]:
+    best: Optional[Candidate] = None
     question = _QA_QUESTIONS[field]
-    for page in pages:
+    planned = context_windows.plan(pages, _FIELD_CUES[field])
+    for page, windows in deadline.iterate(planned, _planned_page):
         text = str(page["text"])
-        if not text.strip():
-            continue
-        try:
-            answer = qa(question=question, context=text)
-        except Exception:
-            continue
+        answer = _ask(page, windows, question)
         score = float(answer.get("score", 0.0))
         value = (answer.get("answer") or "").strip()
         if not value:
             continue
-        span = _locate_span(text, value)
+        span = _answer_span(text, answer)
         if not config.DATE_PATTERN.search(value):
             continue
-        record = {
-            "value": value,
-            "page": int(page["page"]),
-            "span": span,
-            "confidence": score,
-            "evidence": _build_evidence(text, span),
-        }
-        if best is None or score > best["confidence"]:
-            best = record
-    if best and best["confidence"] >= config.QA_SCORE_THRESHOLD:
+        if best is None or score > best.confidence:
+            best = Candidate(value, int(page["page"]), span, score, text)
+    if best and best.confidence >= config.QA_SCORE_THRESHOLD:
         return best
     fallback = _keyword_search_date(pages, keywords)
     if fallback:
-        if not best or fallback["confidence"] >= best["confidence"]:
+        if not best or fallback.confidence >= best.confidence:
             return fallback
     return best
 
 
-def extract_fields(pages: List[Dict[str, object]]) -> Dict[str, object]:
-    parties_candidates: List[Dict[str, object]] = []
-    qa = model.get_qa()
-    for page in pages:
-        text = str(page["text"])
-        if not text.strip():
-            continue
-        try:
-            answer = qa(question=_QA_QUESTIONS["parties"], context=text)
-        except Exception:
-            continue
+def extract_parties(pages: List[Dict[str, object]]) -> List[Candidate]:
+    """Return up to two deduplicated contracting parties."""
+    parties_candidates: List[Candidate] = []
+    planned = context_windows.plan(pages, _FIELD_CUES["parties"])
+    for page, windows in deadline.iterate(planned, _planned_page):
+        answer = _ask(page, windows, _QA_QUESTIONS["parties"])
         score = float(answer.get("score", 0.0))
         if score < config.QA_SCORE_THRESHOLD:
             continue
         value = (answer.get("answer") or "").strip()
         if not value:
             continue
-        extra_answers: List[str] = []
-        try:
-            alt_answers = qa(
-                question=_QA_QUESTIONS["parties"],
-                context=text,
-                top_k=4,
-            )
-            if isinstance(alt_answers, list):
-                extra_answers = [item.get("answer", "") for item in alt_answers if item.get("answer")]
-        except Exception:
-            extra_answers = []
+        extra_answers = [
+            item for item in _ask(page, windows, _QA_QUESTIONS["parties"], top_k=4) if item.get("answer")
+        ]
         parties_candidates.extend(
-            _collect_parties_from_answer(page, value, score, extra_answers=extra_answers)
+            _collect_parties_from_answer(
+                page,
+                value,
+                score,
+                extra_answers=extra_answers,
+                span=_answer_span(str(page["text"]), answer),
+            )
         )
     if len(parties_candidates) < 2:
         # Ask additional targeted questions on pages where QA scored highest.
         ranked_pages = sorted(
             [
-                (
-                    idx,
-                    page,
-                    qa(
-                        question=_QA_QUESTIONS["parties"],
-                        context=str(page["text"]),
-                    ).get("score", 0.0),
-                )
-                for idx, page in enumerate(pages)
-                if str(page.get("text", "")).strip()
+                (page, windows, _ask(page, windows, _QA_QUESTIONS["parties"]).get("score", 0.0))
+                for page, windows in deadline.iterate(planned, _planned_page)
             ],
             key=lambda item: item[2],
             reverse=True,
@@ -388,15 +344,9 @@ def extract_fields(pages: List[Dict[str, object]]) -> Dict[str, object]:
             _QA_QUESTIONS["party_shipper"],
             _QA_QUESTIONS["party_transporter"],
         ]
-        for _, page, _ in ranked_pages[:1]:
-            page_text = str(page["text"])
-            if not page_text.strip():
-                continue
+        for page, windows, _ in ranked_pages[:1]:
             for question in targeted_questions:
-                try:
-                    targeted_answer = qa(question=question, context=page_text)
-                except Exception:
-                    continue
+                targeted_answer = _ask(page, windows, question)
                 t_score = float(targeted_answer.get("score", 0.0))
                 if t_score < _MIN_PARTY_CONFIDENCE:
                     continue
@@ -404,13 +354,15 @@ def extract_fields(pages: List[Dict[str, object]]) -> Dict[str, object]:
                 if not value:
                     continue
                 parties_candidates.extend(
-                    _collect_parties_from_answer(page, value, t_score)
+                    _collect_parties_from_answer(
+                        page, value, t_score, span=_answer_span(str(page["text"]), targeted_answer)
+                    )
                 )
     if len(parties_candidates) < 2:
         parties_candidates.extend(_fallback_parties(pages))
     filtered_candidates = []
     for candidate in parties_candidates:
-        value = (candidate.get("value") or "").strip()
+        value = candidate.value.strip()
         if not value:
             continue
         stripped = re.sub(r"[^A-Za-z0-9&]", "", value)
@@ -428,25 +380,58 @@ def extract_fields(pages: List[Dict[str, object]]) -> Dict[str, object]:
         if word_count < 2:
             continue
         filtered_candidates.append(candidate)
-    parties = _dedupe_entities(filtered_candidates)[:2]
+    return _dedupe_entities(filtered_candidates)[:2]
 
-    effective_date = _extract_date_field(
-        "effective_date", pages, config.EFFECTIVE_DATE_KEYWORDS
-    )
+
+def resolve_fields(fields: Optional[Collection[str]] = None) -> FrozenSet[str]:
+    """Normalize a field selection; ``None`` means all fields.
+
+    ``party_a``/``party_b`` select ``parties``. Raises ``ValueError`` on unknown names.
+    """
+    if fields is None:
+        return frozenset(FIELDS)
+    resolved = set()
+    for name in fields:
+        name = _FIELD_ALIASES.get(name.strip(), name.strip())
+        if name not in FIELDS:
+            raise ValueError(f"Unknown field: {name!r}. Expected one of: {', '.join(FIELDS)}.")
+        resolved.add(name)
+    if not resolved:
+        raise ValueError("Select at least one field.")
+    return frozenset(resolved)
+
+
+def extract_dates(
+    pages: List[Dict[str, object]],
+    fields: Optional[Collection[str]] = None,
+) -> tuple[Optional[Candidate], Optional[Candidate]]:
+    """Return ``(effective_date, agreement_date)``, disambiguating identical answers.
+
+    Dates outside ``fields`` are not computed and come back as ``None``; the
+    identical-answer tie-break only runs when both are requested.
+    """
+    wanted = resolve_fields(fields)
+    effective_date = agreement_date = None
+    if "effective_date" in wanted:
+        effective_date = _extract_date_field(
+            "effective_date", pages, config.EFFECTIVE_DATE_KEYWORDS
+        )
+    if "agreement_date" not in wanted:
+        return effective_date, None
     agreement_date = _extract_date_field(
         "agreement_date", pages, config.AGREEMENT_DATE_KEYWORDS
     )
     if (
         effective_date
         and agreement_date
-        and effective_date.get("value")
-        and agreement_date.get("value")
-        and agreement_date["value"] == effective_date["value"]
+        and effective_date.value
+        and agreement_date.value
+        and agreement_date.value == effective_date.value
     ):
         contextual = _find_contextual_date(
             pages,
             config.AGREEMENT_DATE_CUES,
-            exclude_span=effective_date.get("span"),
+            exclude_span=effective_date.span,
         )
         if contextual:
             agreement_date = contextual
@@ -454,19 +439,120 @@ def extract_fields(pages: List[Dict[str, object]]) -> Dict[str, object]:
         contextual = _find_contextual_date(
             pages,
             config.AGREEMENT_DATE_CUES,
-            exclude_span=effective_date.get("span") if effective_date else None,
+            exclude_span=effective_date.span if effective_date else None,
         )
         if contextual:
             agreement_date = contextual
+    return effective_date, agreement_date
+
+
+def extract_governing_law(pages: List[Dict[str, object]]) -> Optional[Candidate]:
+    """Return the governing law, preferring the gazetteer over a QA sweep."""
+    governing_law = jurisdiction.find_governing_law(pages)
+    if governing_law is None:
+        governing_law = _extract_simple_field("governing_law", pages)
+        if governing_law:
+            _narrow_to_jurisdiction(governing_law, pages)
+    return governing_law
+
+
+def _narrow_to_jurisdiction(candidate: Candidate, pages: List[Dict[str, object]]) -> None:
+    """Canonicalize a QA answer and move its span onto the place it names."""
+    if candidate.start is None or candidate.end is None:
+        canonical = jurisdiction.normalize(candidate.value)
+        if canonical:
+            candidate.value = canonical
+        return
+    text = next(str(page["text"]) for page in pages if int(page["page"]) == candidate.page)
+    found = jurisdiction.locate(text[candidate.start : candidate.end])
+    if found is None:
+        return
+    start, end, canonical = found
+    candidate.value = canonical
+    candidate.start, candidate.end = candidate.start + start, candidate.start + end
+
 
-    governing_law = _extract_simple_field("governing_law", pages)
+def _extract_stage(pages: List[Dict[str, object]], fields: FrozenSet[str]) -> Dict[str, object]:
+    extraction: Dict[str, object] = {}
+    if "parties" in fields:
+        extraction["parties"] = extract_parties(pages)
+    if fields & {"effective_date", "agreement_date"}:
+        effective_date, agreement_date = extract_dates(pages, fields)
+        if "effective_date" in fields:
+            extraction["effective_date"] = effective_date
+        if "agreement_date" in fields:
+            extraction["agreement_date"] = agreement_date
+    if "governing_law" in fields:
+        extraction["governing_law"] = extract_governing_law(pages)
+    return extraction
+
+
+def _extract_selected(pages: List[Dict[str, object]], wanted: FrozenSet[str]) -> Dict[str, object]:
+    extraction: Dict[str, object] = {}
+    for stage in STAGES:
+        if stage & wanted:
+            extraction.update(_extract_stage(pages, stage & wanted))
+    return extraction
+
+
+def _extract_within_budget(
+    pages: List[Dict[str, object]], wanted: FrozenSet[str], budget: deadline.Budget
+) -> Dict[str, object]:
+    """Resolve every field on the preamble first, then widen to the whole document.
+
+    A stage cut short on the second pass keeps its preamble answer, and the
+    pages beyond the preamble are reported as skipped.
+    """
+    preamble = pages[: config.DEADLINE_PREAMBLE_PAGES]
+    rest = pages[len(preamble) :]
+    extraction = _extract_selected(preamble, wanted)
+    if not rest:
+        return extraction
+    skipped_before = set(budget.skipped)
+    complete = True
+    for stage in STAGES:
+        if not stage & wanted:
+            continue
+        if budget.expired:
+            complete = False
+            break
+        result = _extract_stage(pages, stage & wanted)
+        if budget.expired:
+            complete = False
+            break
+        extraction.update(result)
+    if not complete:
+        budget.skipped = skipped_before | {int(page["page"]) for page in rest}
+    return extraction
+
+
+def extract_fields(
+    pages: List[Dict[str, object]],
+    fields: Optional[Collection[str]] = None,
+    deadline_seconds: Optional[float] = None,
+) -> Dict[str, object]:
+    """Extract the selected ``fields`` (all by default), skipping work for the rest.
 
-    return {
-        "parties": parties,
-        "effective_date": effective_date,
-        "agreement_date": agreement_date,
-        "governing_law": governing_law,
-    }
+    With ``deadline_seconds`` (or a deadline already active for the request),
+    the result also carries ``partial`` and ``skipped_pages``.
+    """
+    wanted = resolve_fields(fields)
+    with deadline.within(deadline_seconds) as budget:
+        if budget is None:
+            return _extract_selected(pages, wanted)
+        extraction = _extract_within_budget(pages, wanted, budget)
+        extraction["partial"] = budget.partial
+        extraction["skipped_pages"] = budget.skipped_pages
+        return extraction
 
 
-__all__ = ["extract_fields", "_locate_span"]
+__all__ = [
+    "FIELDS",
+    "STAGES",
+    "extract_dates",
+    "extract_fields",
+    "extract_governing_law",
+    "extract_parties",
+    "resolve_fields",
+    "_locate_span",
+]
@@ -0,0 +1,121 @@
+"""Per-document store that lets revised contract versions reuse prior inference.
+
+Records hold page hashes, model output offsets and scores, and the extracted
+field values; page text, QA answer strings and evidence snippets are not
+stored. Records older than ``REVISION_RETENTION_DAYS`` are removed by ``purge``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+
+from core import config, utils
+from services import inference
+
+
+def _record_path(file_hash: str) -> Path:
+    return Path(config.REVISION_STORE_DIR) / f"{file_hash}.json"
+
+
+def page_digests(pages: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Return ``{"page", "sha256"}`` entries identifying each page by content."""
+    return [
+        {"page": int(page["page"]), "sha256": inference.page_digest(str(page["text"]))}
+        for page in pages
+    ]
+
+
+def load(file_hash: str) -> Optional[Dict[str, object]]:
+    """Return the stored record for a processed file hash, if any."""
+    if not utils.is_sha256(file_hash):
+        return None
+    path = _record_path(file_hash)
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def save(
+    file_hash: str,
+    pages: List[Dict[str, object]],
+    outputs: inference.PageOutputMap,
+    entities: List[Dict[str, object]],
+) -> None:
+    """Persist page hashes, per-page model outputs and final entities for ``file_hash``."""
+    path = _record_path(file_hash)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "file_sha256": file_hash,
+        "pages": page_digests(pages),
+        "outputs": inference.strip_text(outputs),
+        "entities": [
+            {key: value for key, value in entity.items() if key != "evidence"} for entity in entities
+        ],
+    }
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(record, handle, ensure_ascii=True)
+    os.replace(tmp_path, path)
+
+
+def purge(now: Optional[float] = None) -> int:
+    """Delete records older than ``REVISION_RETENTION_DAYS``; return how many went."""
+    if config.REVISION_RETENTION_DAYS <= 0:
+        return 0
+    root = Path(config.REVISION_STORE_DIR)
+    if not root.is_dir():
+        return 0
+    cutoff = (time.time() if now is None else now) - config.REVISION_RETENTION_DAYS * 86400
+    removed = 0
+    for path in root.glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def changed_pages(
+    pages: List[Dict[str, object]], previous: Mapping[str, object]
+) -> tuple[List[int], List[int]]:
+    """Split page numbers into ``(changed, reused)`` by content hash against ``previous``."""
+    known = {str(entry["sha256"]) for entry in previous.get("pages", [])}
+    changed: List[int] = []
+    reused: List[int] = []
+    for entry in page_digests(pages):
+        (reused if entry["sha256"] in known else changed).append(int(entry["page"]))
+    return changed, reused
+
+
+def diff_entities(
+    previous: List[Mapping[str, object]], current: List[Mapping[str, object]]
+) -> List[Dict[str, object]]:
+    """Return field-level value differences between two serialized entity lists."""
+    before = {str(entity["field"]): entity for entity in previous}
+    after = {str(entity["field"]): entity for entity in current}
+    changes: List[Dict[str, object]] = []
+    for field in [*before, *(name for name in after if name not in before)]:
+        old = before.get(field)
+        new = after.get(field)
+        old_value = old.get("value") if old else None
+        new_value = new.get("value") if new else None
+        if old_value == new_value:
+            continue
+        changes.append(
+            {
+                "field": field,
+                "previous": old_value,
+                "current": new_value,
+                "page": new.get("page") if new else None,
+            }
+        )
+    return changes
+
+
+__all__ = ["changed_pages", "diff_entities", "load", "page_digests", "purge", "save"]
@@ -0,0 +1,282 @@
+"""Long-lived extraction worker processes for multi-core scaling inside one server.
+
+Each worker owns its own model pipelines and handles one document at a time
+over a duplex pipe. Workers retire after ``WORKER_MAX_DOCUMENTS`` documents or
+once their resident memory passes ``WORKER_MAX_RSS_MB`` (pdfplumber grows over
+time), and the pool replaces them transparently.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import resource
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional
+
+from core import config
+
+ExtractionTarget = Callable[..., Dict[str, Any]]
+
+
+class WorkerError(RuntimeError):
+    """Raised when a worker fails or dies while processing a document."""
+
+
+class PoolBusyError(RuntimeError):
+    """Raised when no worker becomes available within the queue timeout."""
+
+
+def extract_document(
+    pdf_bytes: bytes,
+    file_hash: str,
+    fields: Optional[List[str]] = None,
+    deadline_seconds: Optional[float] = None,
+    pages: Optional[List[Dict[str, object]]] = None,
+    prior: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Default worker target: parse and extract one PDF inside the worker process.
+
+    Already-parsed ``pages`` (e.g. one sub-document of a packet or one stream
+    stage) skip parsing; ``prior`` outputs from an earlier version or stage are
+    replayed instead of recomputed.
+    """
+    from services import deadline, inference, pdf_text, qa_extract
+
+    with deadline.within(deadline_seconds):
+        if pages is None:
+            pages = pdf_text.extract_pages(pdf_bytes)
+        if not pages:
+            return {"pages": [], "extraction": {}, "outputs": {}}
+        with inference.recording(prior=prior) as outputs:
+            extraction = qa_extract.extract_fields(pages, fields=fields)
+    return {"pages": pages, "extraction": extraction, "outputs": outputs.outputs}
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, in KiB on Linux; good enough as a ceiling check.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_main(
+    conn: Connection,
+    target: ExtractionTarget,
+    max_documents: int,
+    max_rss_mb: float,
+    warm_models: bool,
+    workers: int,
+) -> None:
+    from core import config, model
+
+    # Worker processes already partition the cores: one replica each, with torch
+    # threads sized to this worker's share so the pool does not oversubscribe.
+    config.MODEL_POOL_SIZE = 1
+    config.MODEL_TORCH_THREADS = max(1, (os.cpu_count() or 1) // max(1, workers))
+    if warm_models:
+        model.warm()
+    handled = 0
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        pdf_bytes, file_hash, options = message
+        try:
+            result = ("ok", target(pdf_bytes, file_hash, **options))
+        except Exception as exc:  # surfaced to the parent as WorkerError
+            result = ("error", f"{type(exc).__name__}: {exc}")
+        handled += 1
+        retire = handled >= max_documents or (max_rss_mb > 0 and _rss_mb() > max_rss_mb)
+        conn.send((result, retire))
+        if retire:
+            break
+    conn.close()
+
+
+class _Worker:
+    __slots__ = ("process", "conn")
+
+    def __init__(self, process: multiprocessing.process.BaseProcess, conn: Connection) -> None:
+        self.process = process
+        self.conn = conn
+
+
+class WorkerPool:
+    """Fixed-size pool of extraction processes with checkout-per-document semantics."""
+
+    def __init__(
+        self,
+        size: int,
+        max_documents: int,
+        max_rss_mb: float,
+        queue_timeout: float,
+        job_timeout: Optional[float] = None,
+        target: ExtractionTarget = extract_document,
+        warm_models: bool = True,
+        start_method: str = "spawn",
+    ) -> None:
+        self.size = size
+        self.max_documents = max_documents
+        self.max_rss_mb = max_rss_mb
+        self.queue_timeout = queue_timeout
+        self.job_timeout = job_timeout
+        self.target = target
+        self.warm_models = warm_models
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.documents = 0
+        self.recycled = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    def start(self) -> None:
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe(duplex=True)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.target, self.max_documents, self.max_rss_mb, self.warm_models, self.size),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: _Worker, kill: bool = False) -> None:
+        worker.conn.close()
+        if kill:
+            worker.process.kill()
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def submit(self, pdf_bytes: bytes, file_hash: str, **options: Any) -> Dict[str, Any]:
+        """Run the target for one document in a worker; blocks until it finishes.
+
+        ``options`` are passed to the target as keyword arguments. A worker
+        that does not answer within ``job_timeout`` is killed and replaced.
+        """
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise PoolBusyError("No extraction worker available.") from None
+        try:
+            worker.conn.send((pdf_bytes, file_hash, options))
+            if not worker.conn.poll(self.job_timeout):
+                with self._lock:
+                    self.timeouts += 1
+                self._replace(worker, kill=True)
+                raise WorkerError("Extraction worker timed out.")
+            (status, payload), retire = worker.conn.recv()
+        except (EOFError, OSError) as exc:
+            self._replace(worker)
+            raise WorkerError("Extraction worker exited unexpectedly.") from exc
+        with self._lock:
+            self.documents += 1
+            if retire:
+                self.recycled += 1
+            if status != "ok":
+                self.failures += 1
+        if retire:
+            self._retire(worker)
+            worker = self._spawn()
+        if self._closed:
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+        if status != "ok":
+            raise WorkerError(payload)
+        return payload
+
+    def _replace(self, worker: _Worker, kill: bool = False) -> None:
+        with self._lock:
+            self.failures += 1
+        self._retire(worker, kill=kill)
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            pids = [worker.process.pid for worker in self._workers]
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "documents": self.documents,
+            "recycled": self.recycled,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "pids": pids,
+        }
+
+    def stop(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            self._retire(worker)
+
+
+_POOL: Optional[WorkerPool] = None
+
+
+def start_pool() -> WorkerPool:
+    """Start the process-wide pool sized from config."""
+    global _POOL
+    if _POOL is None:
+        _POOL = WorkerPool(
+            size=config.WORKER_PROCESSES,
+            max_documents=config.WORKER_MAX_DOCUMENTS,
+            max_rss_mb=config.WORKER_MAX_RSS_MB,
+            queue_timeout=config.WORKER_QUEUE_TIMEOUT_SECONDS,
+            job_timeout=config.WORKER_JOB_TIMEOUT_SECONDS,
+        )
+        _POOL.start()
+    return _POOL
+
+
+def get_pool() -> WorkerPool:
+    return start_pool()
+
+
+def stop_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.stop()
+        _POOL = None
+
+
+__all__ = [
+    "PoolBusyError",
+    "WorkerError",
+    "WorkerPool",
+    "extract_document",
+    "get_pool",
+    "start_pool",
+    "stop_pool",
+]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+class _DummyQA:
+    def __call__(self, *args, **kwargs):  # pragma: no cover - simple stub
+        return {"answer": "", "score": 0.0}
+
+
+class _DummyNER:
+    def __call__(self, *args, **kwargs):  # pragma: no cover - simple stub
+        return []
+
+
+@pytest.fixture(autouse=True)
+def isolated_page_cache(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Generator[None, None, None]:
+    from services import page_cache
+
+    page_cache.reset()
+    monkeypatch.setattr("core.config.PAGE_CACHE_PATH", str(tmp_path / "page_cache.db"))
+    yield
+    page_cache.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setattr("core.config.REVISION_STORE_DIR", str(tmp_path / "revisions"))
+    monkeypatch.setattr("core.config.AUDIT_LOG_PATH", str(tmp_path / "audit.log"))
+
+
+@pytest.fixture
+def test_client(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+    from core import model
+
+    model.clear_caches()
+    dummy_qa = _DummyQA()
+    dummy_ner = _DummyNER()
+    monkeypatch.setattr("core.model.get_qa", lambda: dummy_qa)
+    monkeypatch.setattr("core.model.get_ner", lambda: dummy_ner)
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from core import config, logging
+
+HASH_A = "a" * 64
+HASH_B = "b" * 64
+
+
+@pytest.fixture
+def sqlite_audit(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    logging.reset_store()
+    monkeypatch.setattr("core.config.AUDIT_BACKEND", "sqlite")
+    monkeypatch.setattr("core.config.AUDIT_DB_PATH", str(tmp_path / "audit.db"))
+    yield
+    logging.reset_store()
+
+
+def _seed() -> None:
+    logging.append_audit(HASH_A, "2024-01-01T00:00:00+00:00", [{"field": "parties", "confidence": 0.9}])
+    logging.append_audit(HASH_B, "2024-02-01T00:00:00+00:00", [{"field": "governing_law", "confidence": 0.8}])
+    logging.append_audit(HASH_A, "2024-03-01T00:00:00+00:00", [{"field": "parties", "confidence": 0.7}])
+
+
+def test_sqlite_queries_by_hash_and_range(sqlite_audit) -> None:
+    _seed()
+
+    records = logging.query_by_hash(HASH_A)
+    assert [record["timestamp_utc"] for record in records] == [
+        "2024-01-01T00:00:00+00:00",
+        "2024-03-01T00:00:00+00:00",
+    ]
+    assert records[1]["fields"] == [{"field": "parties", "confidence": 0.7}]
+
+    window = logging.query_range("2024-01-15T00:00:00+00:00", "2024-03-01T00:00:00+00:00")
+    assert [record["file_sha256"] for record in window] == [HASH_B]
+
+
+def test_compaction_applies_retention(sqlite_audit, monkeypatch: pytest.MonkeyPatch) -> None:
+    _seed()
+    monkeypatch.setattr("core.config.AUDIT_RETENTION_DAYS", 30)
+
+    deleted = logging.compact(now=datetime(2024, 3, 15, tzinfo=timezone.utc))
+
+    assert deleted == 2
+    assert [record["timestamp_utc"] for record in logging.query_range()] == ["2024-03-01T00:00:00+00:00"]
+
+
+def test_export_matches_jsonl_format(sqlite_audit, monkeypatch: pytest.MonkeyPatch) -> None:
+    _seed()
+    exported = list(logging.export_jsonl())
+
+    monkeypatch.setattr("core.config.AUDIT_BACKEND", "jsonl")
+    _seed()
+    with open(config.AUDIT_LOG_PATH, "r", encoding="utf-8") as handle:
+        flat = sorted(handle.readlines(), key=lambda line: json.loads(line)["timestamp_utc"])
+
+    assert exported == flat
+
+
+def test_audit_endpoints(sqlite_audit, test_client) -> None:
+    _seed()
+
+    response = test_client.get(f"/audit/{HASH_A}")
+    assert response.status_code == 200
+    assert len(response.json()["records"]) == 2
+
+    assert test_client.get(f"/audit/{'c' * 64}").status_code == 404
+    assert test_client.get("/audit/not-a-hash").status_code == 400
+
+    ranged = test_client.get("/audit", params={"start": "2024-02-01T00:00:00", "limit": 1})
+    assert ranged.status_code == 200
+    assert [record["file_sha256"] for record in ranged.json()["records"]] == [HASH_B]
+
+    export = test_client.get("/audit/export")
+    assert export.status_code == 200
+    assert len(export.text.splitlines()) == 3
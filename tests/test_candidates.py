@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from services import qa_extract
+from services.candidates import Candidate
+
+
+def test_candidate_builds_evidence_lazily() -> None:
+    text = "This Agreement is entered into by and between Alpha Corp and Beta LLC."
+    start = text.index("Alpha")
+    candidate = Candidate("Alpha Corp", 1, [start, start + 10], 0.8, text)
+    assert candidate.span == [start, start + 10]
+    assert candidate.get("value") == "Alpha Corp"
+    assert candidate["confidence"] == 0.8
+    assert candidate.get("unknown", "fallback") == "fallback"
+    assert "Alpha Corp" in candidate.evidence
+    assert candidate.to_dict()["evidence"] == candidate.evidence
+
+
+def test_candidate_without_span_has_no_evidence() -> None:
+    candidate = Candidate("Alpha Corp", 1, None, 0.5, "Alpha Corp")
+    assert candidate.span is None
+    assert candidate.get("evidence") is None
+
+
+def test_dedupe_keeps_highest_confidence_per_norm() -> None:
+    text = "Alpha Corp. and ALPHA CORP and Beta LLC"
+    entities = [
+        Candidate("Alpha Corp.", 1, [0, 11], 0.4, text),
+        Candidate("ALPHA CORP", 1, [16, 26], 0.7, text),
+        Candidate("Beta LLC", 2, [31, 39], 0.6, text),
+    ]
+    deduped = qa_extract._dedupe_entities(entities)
+    assert [item.value for item in deduped] == ["ALPHA CORP", "Beta LLC"]
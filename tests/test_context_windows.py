@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from services import context_windows, inference, qa_extract
+
+_FILLER = "Lorem ipsum dolor sit amet. " * 40
+_PREAMBLE = "This Agreement is made by and between Alpha Corp and Beta LLC."
+_PAGE = _FILLER + _PREAMBLE + " " + _FILLER
+
+
+def test_build_merges_overlapping_windows() -> None:
+    text = "alpha governed by beta " + "x " * 10 + "governing law gamma " + "y " * 200
+    windows = context_windows.build(text, ("governed by", "governing law"), before=10, after=40)
+    assert len(windows) == 1
+    start, end = windows[0]
+    assert text[start:end].startswith("alpha")
+    assert end < len(text)
+
+
+def test_plan_reads_whole_pages_only_without_any_cue_hit() -> None:
+    pages = [{"page": 1, "text": _FILLER}, {"page": 2, "text": _PAGE}]
+    planned = context_windows.plan(pages, ("by and between",))
+    assert [page["page"] for page, _ in planned] == [2]
+
+    fallback = context_windows.plan([{"page": 1, "text": _FILLER}], ("by and between",))
+    assert fallback[0][1] == [(0, len(_FILLER))]
+
+
+class _WindowQA:
+    """Answers with the first party when it appears in the context it is given."""
+
+    def __init__(self) -> None:
+        self.contexts: list[str] = []
+
+    def __call__(self, question: str, context: str, **kwargs: object):
+        self.contexts.append(context)
+        offset = context.find("Alpha Corp")
+        answer = {"answer": "Alpha Corp", "score": 0.9, "start": offset, "end": offset + 10}
+        if offset == -1:
+            answer = {"answer": "", "score": 0.0, "start": 0, "end": 0}
+        return [answer] if kwargs.get("top_k") else answer
+
+
+def test_window_answers_map_back_to_page_spans(monkeypatch: pytest.MonkeyPatch) -> None:
+    qa = _WindowQA()
+    monkeypatch.setattr("core.model.get_qa", lambda: qa)
+    monkeypatch.setattr("core.model.get_ner", lambda: lambda text: [])
+
+    (start, end), = context_windows.build(_PAGE, ("by and between",))
+    answer = inference.qa(_PAGE, "Who?", start=start, end=end)
+    assert _PAGE[answer["start"] : answer["end"]] == "Alpha Corp"
+
+    parties = qa_extract.extract_parties([{"page": 1, "text": _PAGE}])
+    assert all(len(context) < len(_PAGE) for context in qa.contexts)
+    alpha = next(party for party in parties if party.value == "Alpha Corp")
+    assert _PAGE[alpha.span[0] : alpha.span[1]] == "Alpha Corp"
+    assert "Alpha Corp" in alpha.evidence
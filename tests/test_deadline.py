@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import deadline, pdf_text, qa_extract
+
+_PREAMBLE = (
+    "This Agreement is made by and between Alpha Corp and Beta LLC, effective as of 1 June 2024. "
+    "It is governed by the laws of the State of Texas."
+)
+_PAGES = [{"page": 1, "text": _PREAMBLE}] + [
+    {"page": number, "text": f"Schedule {number}. Services provided by and between the parties, item {number}."}
+    for number in range(2, 9)
+]
+_CALL_SECONDS = 0.02
+
+
+@pytest.fixture
+def slow_models(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _qa(question: str, context: str, **kwargs: object):
+        time.sleep(_CALL_SECONDS)
+        answer = {"answer": "", "score": 0.0}
+        return [answer] if kwargs.get("top_k") else answer
+
+    def _ner(text: str) -> list:
+        time.sleep(_CALL_SECONDS)
+        return []
+
+    monkeypatch.setattr("core.model.get_qa", lambda: _qa)
+    monkeypatch.setattr("core.model.get_ner", lambda: _ner)
+    monkeypatch.setattr("core.config.PAGE_CACHE_ENABLED", False)
+
+
+def test_deadline_returns_preamble_results_and_skipped_pages(
+    slow_models, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # The single preamble page takes ~10 model calls; the whole document ~45.
+    monkeypatch.setattr("core.config.DEADLINE_PREAMBLE_PAGES", 1)
+    started = time.perf_counter()
+    result = qa_extract.extract_fields(_PAGES, deadline_seconds=0.35)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35 + 5 * _CALL_SECONDS
+    assert result["partial"] is True
+    assert result["governing_law"]["value"] == "Texas"
+    assert set(range(2, 9)) <= set(result["skipped_pages"])
+    assert 1 not in result["skipped_pages"]
+
+
+def test_generous_deadline_is_not_partial(slow_models) -> None:
+    result = qa_extract.extract_fields(_PAGES[:3], fields=["governing_law"], deadline_seconds=30)
+    assert result["partial"] is False
+    assert result["skipped_pages"] == []
+    assert "partial" not in qa_extract.extract_fields(_PAGES[:3], fields=["governing_law"])
+
+
+def test_pdf_parsing_stops_between_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _slow_pages(_: bytes):
+        for number in range(1, 6):
+            time.sleep(0.03)
+            yield f"page {number}"
+
+    monkeypatch.setitem(pdf_text.BACKENDS, "slow", _slow_pages)
+    monkeypatch.setitem(pdf_text._PAGE_COUNTERS, "slow", lambda _: 5)
+    with deadline.within(0.05) as budget:
+        pages = pdf_text.extract_pages(b"pdf", backend="slow")
+    assert [page["page"] for page in pages] == [1, 2]
+    assert budget.skipped_pages == [3, 4, 5]
+
+
+def test_extract_endpoint_reports_partial_results(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient, slow_models
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: _PAGES)
+    upload = {"file": ("a.pdf", b"pdf", "application/pdf")}
+
+    response = test_client.post("/extract", files=upload, data={"deadline": "0.1"})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["partial"] is True
+    assert payload["skipped_pages"]
+    assert {entity["field"] for entity in payload["entities"]} >= {"governing_law"}
+
+    assert test_client.post("/extract?deadline=-1", files=upload).status_code == 400
+
+
+def test_stream_and_packet_endpoints_honour_deadline(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient, slow_models
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: _PAGES)
+    upload = {"file": ("a.pdf", b"pdf", "application/pdf")}
+
+    streamed = test_client.post("/extract/stream", files=upload, data={"deadline": "0.1"})
+    provenance = json.loads(streamed.text.strip().split("\n\n")[-1].split("data: ", 1)[1])
+    assert provenance["partial"] is True
+    assert provenance["skipped_pages"]
+
+    packed = test_client.post("/extract/packet", files=upload, data={"deadline": "0.1"})
+    assert packed.status_code == 200
+    documents = packed.json()["documents"]
+    assert any(document["partial"] for document in documents)
+
+    assert test_client.post("/extract/stream?deadline=0", files=upload).status_code == 400
+    assert test_client.post("/extract/packet?deadline=abc", files=upload).status_code == 400
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+
+import httpx
+import pytest
+
+from app.dispatcher import Dispatcher, HashRing, UploadHasher
+
+_NODES = ["http://node-a", "http://node-b", "http://node-c"]
+
+
+class _Body(httpx.AsyncByteStream):
+    """Unread streaming body, like a real backend response."""
+
+    def __init__(self, payload: dict) -> None:
+        self._data = json.dumps(payload).encode()
+
+    async def __aiter__(self):
+        yield self._data
+
+
+def test_ring_only_moves_keys_owned_by_a_removed_node() -> None:
+    ring = HashRing(_NODES, vnodes=64)
+    keys = [hashlib.sha256(str(index).encode()).hexdigest() for index in range(600)]
+    before = {key: ring.node_for(key) for key in keys}
+    assert set(before.values()) == set(_NODES)
+
+    ring.remove("http://node-b")
+    after = {key: ring.node_for(key) for key in keys}
+    moved = [key for key in keys if before[key] != after[key]]
+    assert moved and all(before[key] == "http://node-b" for key in moved)
+
+
+def test_upload_hasher_matches_file_digest_across_chunks() -> None:
+    content = b"%PDF-1.4 " + bytes(range(256)) * 40
+    request = httpx.Request(
+        "POST", "http://dispatcher/extract", files={"file": ("a.pdf", content, "application/pdf")}, data={"x": "1"}
+    )
+    body = request.read()
+    hasher = UploadHasher(request.headers["content-type"].encode())
+    for index in range(0, len(body), 97):
+        hasher.feed(body[index : index + 97])
+    assert hasher.hexdigest() == hashlib.sha256(content).hexdigest()
+
+
+def test_dispatcher_routes_by_hash_and_fails_over() -> None:
+    down: set[str] = set()
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        node = f"http://{request.url.host}"
+        if node in down:
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(
+            200, headers={"content-type": "application/json"}, stream=_Body({"node": node})
+        )
+
+    dispatcher = Dispatcher(_NODES, vnodes=64, transport=httpx.MockTransport(backend))
+
+    async def upload(client: httpx.AsyncClient, content: bytes) -> str:
+        response = await client.post("/extract", files={"file": ("doc.pdf", content, "application/pdf")})
+        assert response.status_code == 200
+        return response.json()["node"]
+
+    async def _run() -> None:
+        transport = httpx.ASGITransport(app=dispatcher)
+        async with httpx.AsyncClient(transport=transport, base_url="http://dispatcher") as client:
+            owner = await upload(client, b"contract-1")
+            assert owner == dispatcher.ring.node_for(hashlib.sha256(b"contract-1").hexdigest())
+            assert await upload(client, b"contract-1") == owner
+
+            file_hash = hashlib.sha256(b"contract-1").hexdigest()
+            assert (await client.get(f"/audit/{file_hash}")).json()["node"] == owner
+
+            down.add(owner)
+            failover = await upload(client, b"contract-1")
+            assert failover != owner
+
+            await dispatcher.check_health()
+            assert not dispatcher.is_healthy(owner)
+
+            down.clear()
+            await dispatcher.check_health()
+            assert dispatcher.is_healthy(owner)
+            assert await upload(client, b"contract-1") == owner
+
+            stats = (await client.get("/dispatcher/stats")).json()
+            assert {backend["url"] for backend in stats["backends"]} == set(_NODES)
+
+    asyncio.run(_run())
+
+
+def test_revision_requests_follow_the_previous_version() -> None:
+    def backend(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"content-type": "application/json"}, stream=_Body({"node": f"http://{request.url.host}"})
+        )
+
+    dispatcher = Dispatcher(_NODES, vnodes=64, transport=httpx.MockTransport(backend))
+    previous = hashlib.sha256(b"contract-v1").hexdigest()
+    owner = dispatcher.ring.node_for(previous)
+    revised = next(
+        content
+        for content in (f"contract-v2-{index}".encode() for index in range(100))
+        if dispatcher.ring.node_for(hashlib.sha256(content).hexdigest()) != owner
+    )
+
+    async def _run() -> None:
+        transport = httpx.ASGITransport(app=dispatcher)
+        async with httpx.AsyncClient(transport=transport, base_url="http://dispatcher") as client:
+            response = await client.post(
+                "/extract/revision",
+                files={"file": ("v2.pdf", revised, "application/pdf")},
+                data={"previous_sha256": previous.upper()},
+            )
+            assert response.json()["node"] == owner
+            revised_hash = hashlib.sha256(revised).hexdigest()
+            assert (await client.get(f"/audit/{revised_hash}")).json()["node"] == owner
+
+    asyncio.run(_run())
+
+
+def test_only_undelivered_requests_are_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("core.config.DISPATCHER_EJECT_AFTER_FAILURES", 10)
+    hits: list[str] = []
+    failure: dict[str, type] = {}
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        node = f"http://{request.url.host}"
+        hits.append(node)
+        if node in failure:
+            raise failure[node]("failed", request=request)
+        return httpx.Response(200, headers={"content-type": "application/json"}, stream=_Body({"node": node}))
+
+    dispatcher = Dispatcher(_NODES, vnodes=64, transport=httpx.MockTransport(backend))
+    owner = dispatcher.ring.node_for(hashlib.sha256(b"contract-1").hexdigest())
+
+    async def _run() -> None:
+        transport = httpx.ASGITransport(app=dispatcher)
+        async with httpx.AsyncClient(transport=transport, base_url="http://dispatcher") as client:
+            upload = {"file": ("doc.pdf", b"contract-1", "application/pdf")}
+            failure[owner] = httpx.ConnectError
+            assert (await client.post("/extract", files=upload)).json()["node"] != owner
+            assert len(hits) == 2
+
+            for error, status in ((httpx.ReadTimeout, 504), (httpx.RemoteProtocolError, 502)):
+                hits.clear()
+                failure[owner] = error
+                assert (await client.post("/extract", files=upload)).status_code == status
+                assert hits == [owner]
+
+    asyncio.run(_run())
+
+
+def test_backends_join_and_leave_at_runtime() -> None:
+    def backend(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"content-type": "application/json"}, stream=_Body({"node": f"http://{request.url.host}"})
+        )
+
+    dispatcher = Dispatcher(_NODES[:2], vnodes=64, transport=httpx.MockTransport(backend))
+
+    async def _run() -> None:
+        transport = httpx.ASGITransport(app=dispatcher)
+        async with httpx.AsyncClient(transport=transport, base_url="http://dispatcher") as client:
+            joined = await client.post("/dispatcher/backends", json={"url": "http://node-c/"})
+            assert {node["url"] for node in joined.json()["backends"]} == set(_NODES)
+
+            left = await client.request("DELETE", "/dispatcher/backends", json={"url": "http://node-a"})
+            assert {node["url"] for node in left.json()["backends"]} == {"http://node-b", "http://node-c"}
+            assert "http://node-a" not in dispatcher.ring.nodes
+
+            assert (await client.post("/dispatcher/backends", content=b"{}")).status_code == 400
+
+    asyncio.run(_run())
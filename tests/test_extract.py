@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
@@ -10,31 +9,6 @@ from fastapi.testclient import TestClient
 from core import config, utils
 
 
-class _DummyQA:
-    def __call__(self, *args, **kwargs):  # pragma: no cover - simple stub
-        return {"answer": "", "score": 0.0}
-
-
-class _DummyNER:
-    def __call__(self, *args, **kwargs):  # pragma: no cover - simple stub
-        return []
-
-
-@pytest.fixture
-def test_client(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
-    from core import model
-
-    model.clear_caches()
-    dummy_qa = _DummyQA()
-    dummy_ner = _DummyNER()
-    monkeypatch.setattr("core.model.get_qa", lambda: dummy_qa)
-    monkeypatch.setattr("core.model.get_ner", lambda: dummy_ner)
-    from app.main import app
-
-    with TestClient(app) as client:
-        yield client
-
-
 def test_sha256_bytes() -> None:
     digest = utils.sha256_bytes(b"legal")
     assert digest == "a708df92c9e46229e8f1cd50d8b7d172bda33fc24c8d96d7e9dabf6eba73baa2"
@@ -81,7 +55,7 @@ def test_extract_endpoint(monkeypatch: pytest.MonkeyPatch, test_client: TestClie
     )
     monkeypatch.setattr(
         "services.qa_extract.extract_fields",
-        lambda pages: {
+        lambda pages, fields=None: {
             "parties": [
                 {"value": "Alpha Corp", "page": 1, "span": [23, 33], "confidence": 0.9},
                 {"value": "Beta LLC", "page": 1, "span": [38, 46], "confidence": 0.85},
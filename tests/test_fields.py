@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import qa_extract, revisions
+
+_PAGES = [
+    {
+        "page": 1,
+        "text": "This Agreement is made by and between Alpha Corp and Beta LLC, effective as of 1 June 2024. "
+        "It is governed by the laws of the State of Texas.",
+    }
+]
+
+
+@pytest.fixture
+def model_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    def _qa(question: str, context: str, **_: object) -> dict:
+        calls.append(question)
+        return {"answer": "", "score": 0.0}
+
+    def _ner(text: str) -> list:
+        calls.append("ner")
+        return []
+
+    monkeypatch.setattr("core.model.get_qa", lambda: _qa)
+    monkeypatch.setattr("core.model.get_ner", lambda: _ner)
+    return calls
+
+
+def test_governing_law_only_runs_no_model_calls(model_calls: list[str]) -> None:
+    result = qa_extract.extract_fields(_PAGES, fields=["governing_law"])
+    assert set(result) == {"governing_law"}
+    assert result["governing_law"]["value"] == "Texas"
+    assert model_calls == []
+
+
+def test_single_date_skips_the_other_date_and_tie_break(
+    model_calls: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tie_breaks: list[object] = []
+    original = qa_extract._find_contextual_date
+    monkeypatch.setattr(
+        "services.qa_extract._find_contextual_date",
+        lambda *args, **kwargs: tie_breaks.append(args) or original(*args, **kwargs),
+    )
+    result = qa_extract.extract_fields(_PAGES, fields=["effective_date"])
+    assert set(result) == {"effective_date"}
+    assert set(model_calls) == {qa_extract._QA_QUESTIONS["effective_date"]}
+    assert tie_breaks == []
+
+
+def test_resolve_fields_accepts_party_aliases_and_rejects_unknown() -> None:
+    assert qa_extract.resolve_fields(["party_a", "governing_law"]) == {"parties", "governing_law"}
+    with pytest.raises(ValueError):
+        qa_extract.resolve_fields(["termination_date"])
+
+
+def test_extract_endpoint_honours_field_selection(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: _PAGES)
+    upload = {"file": ("a.pdf", b"pdf", "application/pdf")}
+
+    response = test_client.post("/extract", files=upload, data={"fields": "governing_law"})
+    assert response.status_code == 200
+    assert [entity["field"] for entity in response.json()["entities"]] == ["governing_law"]
+
+    rejected = test_client.post("/extract?fields=governing_law,ceo", files=upload)
+    assert rejected.status_code == 400
+    assert "ceo" in rejected.json()["detail"]
+
+
+def test_narrowed_extraction_keeps_full_revision_record(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: _PAGES)
+    upload = {"file": ("a.pdf", b"pdf", "application/pdf")}
+
+    full = test_client.post("/extract", files=upload).json()
+    file_hash = full["provenance"]["file_sha256"]
+    test_client.post("/extract", files=upload, data={"fields": "governing_law"})
+
+    stored = revisions.load(file_hash)
+    assert [entity["field"] for entity in stored["entities"]] == [entity["field"] for entity in full["entities"]]
+    assert len(stored["entities"]) > 1
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+from services import jurisdiction, qa_extract
+
+
+def test_anchored_jurisdiction_prefers_longest_phrase() -> None:
+    text = "12. Governing Law. This Agreement shall be governed by the laws of England and Wales."
+    record = jurisdiction.find_governing_law([{"page": 3, "text": text}])
+    assert record is not None
+    assert record["value"] == "England and Wales"
+    assert record["page"] == 3
+    start, end = record["span"]
+    assert text[start:end] == "England and Wales"
+    assert "governed by" in record["evidence"]
+
+
+def test_unanchored_mentions_are_ignored() -> None:
+    pages = [{"page": 1, "text": "Alpha Corp, a company with offices in Texas and Germany."}]
+    assert jurisdiction.find_governing_law(pages) is None
+
+
+def test_word_boundaries_are_respected() -> None:
+    text = "This Agreement is governed by the laws of the State of Arkansas."
+    record = jurisdiction.find_governing_law([{"page": 1, "text": text}])
+    assert record is not None
+    assert record["value"] == "Arkansas"
+
+
+def test_normalize_maps_aliases() -> None:
+    assert jurisdiction.normalize("the laws of the Commonwealth of Massachusetts") == "Massachusetts"
+    assert jurisdiction.normalize("German law") == "Germany"
+    assert jurisdiction.normalize("the parties' agreement") is None
+
+
+def test_extract_fields_skips_qa_for_gazetteer_hit(monkeypatch: pytest.MonkeyPatch) -> None:
+    questions: list[str] = []
+
+    def _qa(question: str, context: str, **_: object) -> dict:
+        questions.append(question)
+        return {"answer": "", "score": 0.0}
+
+    monkeypatch.setattr("core.model.get_qa", lambda: _qa)
+    monkeypatch.setattr("core.model.get_ner", lambda: lambda *_args, **_kwargs: [])
+    pages = [{"page": 1, "text": "This Agreement is construed in accordance with the laws of the State of New York."}]
+    result = qa_extract.extract_fields(pages)
+    assert result["governing_law"]["value"] == "New York"
+    assert qa_extract._QA_QUESTIONS["governing_law"] not in questions
+
+
+def test_incorporation_recital_does_not_beat_governing_law_clause() -> None:
+    pages = [
+        {"page": 1, "text": "Alpha Inc., a corporation organized under the laws of the State of Delaware, and Beta LLC."},
+        {"page": 5, "text": "Beta LLC is subject to the laws of Ontario in respect of its licences."},
+        {"page": 9, "text": "This Agreement shall be governed by the laws of the State of New York."},
+    ]
+    record = jurisdiction.find_governing_law(pages)
+    assert record is not None
+    assert record["value"] == "New York"
+    assert record["page"] == 9
+
+
+def test_qa_fallback_span_points_at_the_canonical_place(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _qa(question: str, context: str, **kwargs: object):
+        answer = {"answer": "", "score": 0.0}
+        if question == qa_extract._QA_QUESTIONS["governing_law"]:
+            answer = {"answer": "the courts and laws of the State of Texas", "score": 0.9}
+        return [answer] if kwargs.get("top_k") else answer
+
+    monkeypatch.setattr("core.model.get_qa", lambda: _qa)
+    monkeypatch.setattr("core.model.get_ner", lambda: lambda *_args, **_kwargs: [])
+    text = "Disputes: the courts and laws of the State of Texas apply to this Agreement."
+    record = qa_extract.extract_fields([{"page": 1, "text": text}], fields=["governing_law"])["governing_law"]
+    assert record["value"] == "Texas"
+    start, end = record["span"]
+    assert text[start:end] == "Texas"
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from eval import loadtest
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    samples = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    assert loadtest.percentile(samples, 50) == 0.5
+    assert loadtest.percentile(samples, 95) == 1.0
+    assert loadtest.percentile([], 99) == 0.0
+
+
+def test_run_level_reports_latency_and_status_rates(
+    monkeypatch: pytest.MonkeyPatch, test_client
+) -> None:
+    monkeypatch.setattr(
+        "services.pdf_text.extract_pages",
+        lambda content: [{"page": 1, "text": content.decode()}] if content != b"blank" else [],
+    )
+    corpus = [b"Governed by the laws of Texas.", b"blank"]
+
+    async def _run() -> dict:
+        transport = httpx.ASGITransport(app=test_client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await loadtest.run_level(client, "/extract", corpus, concurrency=2, total_requests=4)
+
+    level = asyncio.run(_run())
+    assert level["requests"] == 4
+    assert level["status_counts"] == {"200": 2, "400": 2}
+    assert level["error_rate"] == 0.5
+    assert level["rate_503"] == 0.0
+    assert level["latency_ms"]["p99"] >= level["latency_ms"]["p50"] > 0
+    assert level["event_loop_lag_ms"]["samples"] >= 1
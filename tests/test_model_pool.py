@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from core import model
+
+
+@pytest.fixture
+def two_replicas(monkeypatch: pytest.MonkeyPatch):
+    model.clear_caches()
+    monkeypatch.setattr("core.config.MODEL_POOL_SIZE", 2)
+    monkeypatch.setattr("core.model.get_qa", lambda: object())
+    yield
+    model.clear_caches()
+
+
+def test_concurrent_checkouts_get_distinct_replicas(two_replicas) -> None:
+    with model.checkout("qa") as first, model.checkout("qa") as second:
+        assert first is not second
+        assert model.pool_stats()["qa"]["in_use"] == 2
+
+
+def test_checkout_waits_for_a_free_replica_and_reports_it(two_replicas) -> None:
+    released = threading.Event()
+    holders = [threading.Thread(target=_hold, args=(released,)) for _ in range(2)]
+    for holder in holders:
+        holder.start()
+    while (model.pool_stats() or {}).get("qa", {}).get("in_use") != 2:
+        time.sleep(0.001)
+
+    threading.Timer(0.05, released.set).start()
+    with model.checkout("qa"):
+        pass
+    for holder in holders:
+        holder.join()
+
+    stats = model.pool_stats()["qa"]
+    assert stats["checkouts"] == 3
+    assert stats["waited"] == 1
+    assert stats["wait_ms_max"] >= 40
+    assert 0 < stats["utilization"] <= 1
+
+
+def _hold(released: threading.Event) -> None:
+    with model.checkout("qa"):
+        released.wait()
+
+
+def test_swapping_the_loader_rebuilds_the_pool(two_replicas, monkeypatch: pytest.MonkeyPatch) -> None:
+    stub = object()
+    monkeypatch.setattr("core.model.get_qa", lambda: stub)
+    with model.checkout("qa") as replica:
+        assert replica is stub
+
+
+def test_inline_extract_requests_run_concurrently(monkeypatch: pytest.MonkeyPatch, test_client) -> None:
+    # Both requests must be inside a QA call at once, i.e. off the event loop.
+    barrier = threading.Barrier(2, timeout=5)
+
+    broken: list[str] = []
+
+    def _qa(question: str, context: str, **_: object) -> dict:
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            broken.append(question)
+        return {"answer": "", "score": 0.0}
+
+    model.clear_caches()
+    monkeypatch.setattr("core.config.MODEL_POOL_SIZE", 2)
+    monkeypatch.setattr("core.config.PAGE_CACHE_ENABLED", False)
+    monkeypatch.setattr("core.model.get_qa", lambda: _qa)
+    pages = {
+        b"one": [{"page": 1, "text": "This Agreement is effective as of 1 June 2024."}],
+        b"two": [{"page": 1, "text": "This Agreement is effective as of 2 June 2024."}],
+    }
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda content: pages[content])
+
+    statuses: list[int] = []
+
+    def _post(content: bytes) -> None:
+        response = test_client.post(
+            "/extract", files={"file": ("a.pdf", content, "application/pdf")}, data={"fields": "effective_date"}
+        )
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=_post, args=(content,)) for content in pages]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert statuses == [200, 200]
+    assert not broken
+    assert model.pool_stats()["qa"]["checkouts"] >= 2
+    model.clear_caches()
+
+
+def test_torch_threads_split_every_core_across_replicas(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("os.cpu_count", lambda: 32)
+    monkeypatch.setattr("core.config.MODEL_POOL_SIZE", 4)
+    assert model.torch_threads() == 8
+    monkeypatch.setattr("core.config.MODEL_POOL_SIZE", 1)
+    assert model.torch_threads() == 32
+    monkeypatch.setattr("core.config.MODEL_TORCH_THREADS", 3)
+    assert model.torch_threads() == 3
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import packet
+
+_PACKET = [
+    {
+        "page": 1,
+        "text": "MASTER SERVICES AGREEMENT. This Agreement is made by and between Alpha Corp and Beta LLC.Page 1 of 3",
+    },
+    {"page": 2, "text": "ARTICLE 4 LICENSE GRANT. Alpha grants Beta a licence to use the Services.Page 2 of 3"},
+    {
+        "page": 3,
+        "text": "This Agreement is governed by the laws of the State of Texas. IN WITNESS WHEREOF the parties "
+        "sign below. By: Jane Roe Title: CEOPage 3 of 3",
+    },
+    {
+        "page": 4,
+        "text": "AMENDMENT NO. 1 TO MASTER SERVICES AGREEMENT. This Amendment is entered into by and between "
+        "Alpha Corp and Gamma Inc.Page 1 of 2",
+    },
+    {"page": 5, "text": "This Amendment is governed by the laws of England and Wales.Page 2 of 2"},
+]
+
+
+def test_split_packet_uses_combined_signals() -> None:
+    documents = packet.split_packet(_PACKET)
+    assert [(doc["start_page"], doc["end_page"]) for doc in documents] == [(1, 3), (4, 5)]
+    assert set(documents[1]["signals"]) == {"title", "preamble", "signature", "page_reset"}
+
+
+def test_capitalized_heading_alone_does_not_split() -> None:
+    assert len(packet.split_packet(_PACKET[:3])) == 1
+
+
+def test_exhibit_after_signature_page_stays_with_its_contract() -> None:
+    pages = _PACKET[:3] + [
+        {"page": 4, "text": "EXHIBIT A STATEMENT OF WORK. Beta will deliver the Services described below."},
+        {"page": 5, "text": "Deliverables and milestones are listed in the table below."},
+    ]
+    documents = packet.split_packet(pages)
+    assert [(doc["start_page"], doc["end_page"]) for doc in documents] == [(1, 5)]
+
+
+def test_extract_packet_runs_sub_documents_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Both calls must be in flight at once for the barrier to release.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _extract(pages, fields=None, deadline_seconds=None):
+        barrier.wait()
+        return {"governing_law": None, "first_page": pages[0]["page"]}
+
+    monkeypatch.setattr("services.qa_extract.extract_fields", _extract)
+    results = packet.extract_packet(_PACKET, max_workers=2)
+    assert [result["extraction"]["first_page"] for result in results] == [1, 4]
+
+
+def test_deadline_second_pass_replays_each_documents_preamble(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, str]] = []
+    lock = threading.Lock()
+
+    def _qa(question: str, context: str, **kwargs: object):
+        with lock:
+            calls.append((question, context))
+        answer = {"answer": "", "score": 0.0}
+        return [answer] if kwargs.get("top_k") else answer
+
+    monkeypatch.setattr("core.model.get_qa", lambda: _qa)
+    monkeypatch.setattr("core.model.get_ner", lambda: lambda *_args, **_kwargs: [])
+    monkeypatch.setattr("core.config.PAGE_CACHE_ENABLED", False)
+    monkeypatch.setattr("core.config.DEADLINE_PREAMBLE_PAGES", 1)
+
+    results = packet.extract_packet(_PACKET, deadline_seconds=30)
+    assert not any(result["extraction"]["partial"] for result in results)
+    assert calls and len(calls) == len(set(calls))
+
+
+class _CountingPool:
+    """Stands in for the worker pool and records how many jobs overlap."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.active = 0
+        self.peak = 0
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    def submit(self, pdf_bytes: bytes, file_hash: str, pages=None, **_: object) -> dict:
+        with self._lock:
+            self.active += 1
+            self.jobs += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return {"pages": pages, "extraction": {"parties": []}, "outputs": {}}
+
+    def stop(self) -> None:
+        pass
+
+
+def test_packet_in_process_mode_caps_in_flight_sub_documents(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("core.config.EXTRACTION_MODE", "process")
+    six_contracts = [
+        dict(page, page=page["page"] + offset * 5) for offset in range(3) for page in _PACKET
+    ]
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: six_contracts)
+    pool = _CountingPool(size=4)
+    monkeypatch.setattr("services.workers._POOL", pool)
+
+    response = test_client.post("/extract/packet", files={"file": ("packet.pdf", b"pdf", "application/pdf")})
+    assert response.status_code == 200
+    assert len(response.json()["documents"]) == 6
+    assert pool.jobs == 6
+    assert pool.peak <= 2
+
+
+def test_packet_endpoint_returns_entities_per_document(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: _PACKET)
+    response = test_client.post(
+        "/extract/packet",
+        files={"file": ("packet.pdf", b"pdf", "application/pdf")},
+        data={"fields": "governing_law"},
+    )
+    assert response.status_code == 200
+    documents = response.json()["documents"]
+    assert [(doc["start_page"], doc["end_page"]) for doc in documents] == [(1, 3), (4, 5)]
+    assert [doc["entities"][0]["value"] for doc in documents] == ["Texas", "England and Wales"]
+    assert [doc["entities"][0]["page"] for doc in documents] == [3, 5]
+
+    (record,) = test_client.get(f"/audit/{response.json()['provenance']['file_sha256']}").json()["records"]
+    assert [(field["document"], field["start_page"]) for field in record["fields"]] == [(1, 1), (2, 4)]
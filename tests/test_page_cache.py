@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from core import model
+from services import inference, page_cache
+
+_PAGE = "Schedule A. Standard terms and conditions apply to all services provided hereunder."
+
+
+def test_cache_serves_repeat_pages_across_documents(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    def _ner(segment: str) -> list:
+        calls.append(segment)
+        return [{"entity_group": "ORG", "score": 0.9, "word": "Schedule", "start": 0, "end": 8}]
+
+    monkeypatch.setattr("core.model.get_ner", lambda: _ner)
+    first = inference.ner(_PAGE, 0, 40)
+    second = inference.ner(_PAGE, 0, 40)
+    assert first == second == [{"entity_group": "ORG", "score": 0.9, "start": 0, "end": 8}]
+    assert len(calls) == 1
+    stats = page_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.5)
+
+
+class _CommittedQA:
+    """QA stub shaped like a pipeline loaded from a specific commit."""
+
+    def __init__(self, commit_hash: str) -> None:
+        self.model = SimpleNamespace(config=SimpleNamespace(_commit_hash=commit_hash))
+
+    def __call__(self, question: str, context: str, **_: object) -> dict:
+        start = context.index("Standard")
+        return {"answer": "Standard terms", "score": 0.7, "start": start, "end": start + 14}
+
+
+def test_cache_is_namespaced_by_resolved_commit(monkeypatch: pytest.MonkeyPatch) -> None:
+    model.clear_caches()
+    monkeypatch.setattr("core.model.get_qa", lambda: _CommittedQA("1" * 40))
+    cache = page_cache.get_cache()
+    assert cache is not None
+    version = page_cache.model_version("qa")
+    assert "1" * 40 in version
+    cache.put("digest", "qa|Who?|1", version, {"score": 0.5})
+    monkeypatch.setattr("core.model.get_qa", lambda: _CommittedQA("2" * 40))
+    assert cache.get("digest", "qa|Who?|1", page_cache.model_version("qa")) is None
+    monkeypatch.setattr("core.config.QA_MODEL_REVISION", "3" * 40)
+    assert "3" * 40 in page_cache.model_version("qa")
+    model.clear_caches()
+
+
+def test_cache_hits_across_whitespace_and_stores_no_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    model.clear_caches()
+    qa = _CommittedQA("1" * 40)
+    calls: list[str] = []
+
+    def _qa(question: str, context: str, **kwargs: object) -> dict:
+        calls.append(context)
+        return qa(question, context, **kwargs)
+
+    monkeypatch.setattr("core.model.get_qa", lambda: _qa)
+    reflowed = "Schedule  A.\nStandard   terms and conditions apply to all services provided hereunder."
+    first = inference.qa(_PAGE, "Which terms?")
+    second = inference.qa(reflowed, "Which terms?")
+    assert len(calls) == 1
+    assert first["answer"] == "Standard terms"
+    assert reflowed[second["start"] : second["end"]] == second["answer"] == "Standard   terms"
+
+    cache = page_cache.get_cache()
+    stored = cache._conn.execute("SELECT output FROM page_outputs").fetchall()
+    assert stored and all("Standard" not in row[0] for row in stored)
+    model.clear_caches()
+
+
+def test_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = page_cache.PageCache(str(tmp_path / "lru.db"), max_entries=3)
+    for index in range(3):
+        cache.put(f"page-{index}", "ner|0:10", "v", [index])
+    assert cache.get("page-0", "ner|0:10", "v") == [0]
+    cache.put("page-3", "ner|0:10", "v", [3])
+    assert cache.get("page-1", "ner|0:10", "v") is None
+    assert cache.get("page-0", "ner|0:10", "v") == [0]
+    assert cache.stats()["evictions"] >= 1
+    cache.close()
+
+
+def test_processes_sharing_a_cache_file_share_its_lru_order(tmp_path) -> None:
+    path = str(tmp_path / "shared.db")
+    first, second = page_cache.PageCache(path, max_entries=3), page_cache.PageCache(path, max_entries=3)
+    first.put("page-0", "ner|0:10", "v", [0])
+    second.put("page-1", "ner|0:10", "v", [1])
+    first.put("page-2", "ner|0:10", "v", [2])
+    assert second.get("page-0", "ner|0:10", "v") == [0]
+    first.put("page-3", "ner|0:10", "v", [3])
+
+    assert second.get("page-1", "ner|0:10", "v") is None
+    assert first.get("page-0", "ner|0:10", "v") == [0]
+    assert first.stats()["entries"] == second.stats()["entries"] <= 3
+    first.close()
+    second.close()
+
+
+def test_stats_endpoint_reports_page_cache(test_client) -> None:
+    response = test_client.get("/stats")
+    assert response.status_code == 200
+    assert response.json()["page_cache"]["enabled"] is True
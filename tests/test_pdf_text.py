@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+from core import config
+from eval.synthetic_pdf import contract_pdf
+from services import jurisdiction, pdf_text
+
+pytest.importorskip("pypdfium2")
+
+
+def _cue_offsets(text: str) -> dict[str, int]:
+    cues = ("by and between", "3 October 2025", "1 November 2025", "governed by")
+    return {cue: text.find(cue) for cue in cues}
+
+
+def test_backends_share_page_contract_and_span_offsets() -> None:
+    pdf_bytes = contract_pdf(3, seed=7)
+    plumber = pdf_text.extract_pages(pdf_bytes, backend="pdfplumber")
+    pdfium = pdf_text.extract_pages(pdf_bytes, backend="pypdfium2")
+    assert [page["page"] for page in plumber] == [page["page"] for page in pdfium] == [1, 2, 3]
+    for left, right in zip(plumber, pdfium):
+        assert _cue_offsets(str(left["text"])) == _cue_offsets(str(right["text"]))
+        assert not any(ord(char) < 32 for char in str(right["text"]))
+    left_law = jurisdiction.find_governing_law(plumber)
+    right_law = jurisdiction.find_governing_law(pdfium)
+    assert left_law is not None and right_law is not None
+    assert (left_law.page, left_law.span) == (right_law.page, right_law.span)
+
+
+def test_default_backend_follows_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "PDF_TEXT_BACKEND", "pypdfium2")
+    assert pdf_text.get_backend() is pdf_text.BACKENDS["pypdfium2"]
+    with pytest.raises(ValueError):
+        pdf_text.get_backend("missing")
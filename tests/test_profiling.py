@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import pstats
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import profiling
+
+_TEXT = "Confidential. This Agreement is made by and between Alpha Corp and Beta LLC."
+
+
+@pytest.fixture
+def profiled_client(monkeypatch: pytest.MonkeyPatch, tmp_path, test_client: TestClient) -> TestClient:
+    monkeypatch.setattr("core.config.PROFILING_ENABLED", True)
+    monkeypatch.setattr("core.config.PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: [{"page": 4, "text": _TEXT}])
+    return test_client
+
+
+def test_profile_header_captures_profile_and_spans(profiled_client: TestClient, tmp_path) -> None:
+    response = profiled_client.post(
+        "/extract",
+        files={"file": ("a.pdf", b"pdf-bytes", "application/pdf")},
+        headers={"X-Profile": "1"},
+    )
+    assert response.status_code == 200
+    provenance = response.json()["provenance"]
+    file_hash = provenance["file_sha256"]
+    assert provenance["profile"].startswith(f"/admin/profiles/{file_hash}/")
+
+    download = profiled_client.get(provenance["profile"])
+    assert download.status_code == 200
+    prof_file = tmp_path / "download.prof"
+    prof_file.write_bytes(download.content)
+    assert pstats.Stats(str(prof_file)).total_calls > 0
+
+    spans = profiled_client.get(f"{provenance['profile']}/spans").json()["spans"]
+    names = {span["name"] for span in spans}
+    assert {"extract_pages", "extract_fields", "qa", "find_parties"} <= names
+    qa_span = next(span for span in spans if span["name"] == "qa")
+    assert qa_span["page"] == 4 and qa_span["question"] and qa_span["source"] == "model"
+    assert "Alpha Corp" not in str(spans)
+
+
+def test_profiling_is_opt_in(profiled_client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    response = profiled_client.post("/extract", files={"file": ("a.pdf", b"pdf-bytes", "application/pdf")})
+    assert "profile" not in response.json()["provenance"]
+
+    monkeypatch.setattr("core.config.PROFILING_ENABLED", False)
+    response = profiled_client.post(
+        "/extract?profile=1", files={"file": ("a.pdf", b"other-bytes", "application/pdf")}
+    )
+    file_hash = response.json()["provenance"]["file_sha256"]
+    assert "profile" not in response.json()["provenance"]
+    assert profiled_client.get(f"/admin/profiles/{file_hash}").status_code == 404
+
+
+def test_repeated_profiles_of_one_file_are_kept_apart(profiled_client: TestClient) -> None:
+    upload = {"file": ("a.pdf", b"pdf-bytes", "application/pdf")}
+    links = [
+        profiled_client.post("/extract", files=upload, headers={"X-Profile": "1"}).json()["provenance"]["profile"]
+        for _ in range(2)
+    ]
+    assert links[0] != links[1]
+    file_hash = links[0].split("/")[3]
+    runs = profiled_client.get(f"/admin/profiles/{file_hash}/runs").json()["runs"]
+    assert [f"/admin/profiles/{file_hash}/{run}" for run in runs] == links
+    assert profiled_client.get(f"{links[0]}/spans").json()["run"] == runs[0]
+    assert profiled_client.get(f"/admin/profiles/{file_hash}/spans").json()["run"] == runs[1]
+    assert profiled_client.get(f"/admin/profiles/{file_hash}/not-a-run").status_code == 404
+
+
+def test_purge_removes_expired_profiles(profiled_client: TestClient) -> None:
+    response = profiled_client.post(
+        "/extract", files={"file": ("a.pdf", b"pdf-bytes", "application/pdf")}, headers={"X-Profile": "1"}
+    )
+    file_hash = response.json()["provenance"]["file_sha256"]
+    stale = time.time() - 8 * 86400
+    for path in (profiling.profile_path(file_hash), profiling.spans_path(file_hash)):
+        os.utime(path, (stale, stale))
+
+    assert profiling.purge() == 2
+    assert profiling.runs(file_hash) == []
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import inference, revisions
+
+_PAGE_ONE = "This Agreement is made by and between Alpha Corp and Beta LLC, effective as of 1 June 2024."
+_PAGE_TWO = "Payment terms apply. This Agreement is governed by the laws of the State of Delaware."
+_PAGE_TWO_REVISED = "Payment terms apply. This Agreement is governed by the laws of the State of New York."
+_VERSIONS = {
+    b"v1": [{"page": 1, "text": _PAGE_ONE}, {"page": 2, "text": _PAGE_TWO}],
+    b"v2": [{"page": 1, "text": _PAGE_ONE}, {"page": 2, "text": _PAGE_TWO_REVISED}],
+}
+
+
+class _CountingQA:
+    def __init__(self) -> None:
+        self.contexts: list[str] = []
+
+    def __call__(self, question: str, context: str, **_: object) -> dict:
+        self.contexts.append(context)
+        return {"answer": "", "score": 0.0}
+
+
+def test_recording_replays_prior_outputs(monkeypatch: pytest.MonkeyPatch) -> None:
+    qa = _CountingQA()
+    monkeypatch.setattr("core.model.get_qa", lambda: qa)
+    with inference.recording() as first:
+        inference.qa(_PAGE_ONE, "Who?")
+    with inference.recording(prior=first.outputs) as second:
+        inference.qa(_PAGE_ONE, "Who?")
+        inference.qa(_PAGE_TWO, "Who?")
+    assert qa.contexts == [_PAGE_ONE, _PAGE_TWO]
+    assert (second.reused, second.computed) == (1, 1)
+    assert set(second.outputs) == {inference.page_digest(_PAGE_ONE), inference.page_digest(_PAGE_TWO)}
+
+
+def test_revision_endpoint_reuses_unchanged_pages(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda content: _VERSIONS[content])
+    qa = _CountingQA()
+    monkeypatch.setattr("core.model.get_qa", lambda: qa)
+
+    first = test_client.post("/extract", files={"file": ("v1.pdf", b"v1", "application/pdf")})
+    assert first.status_code == 200
+    previous_hash = first.json()["provenance"]["file_sha256"]
+    qa.contexts.clear()
+
+    response = test_client.post(
+        "/extract/revision",
+        files={"file": ("v2.pdf", b"v2", "application/pdf")},
+        data={"previous_sha256": previous_hash},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["provenance"]["previous_sha256"] == previous_hash
+    assert body["revision"]["changed_pages"] == [2]
+    assert body["revision"]["reused_pages"] == [1]
+    assert body["revision"]["changes"] == [
+        {"field": "governing_law", "previous": "Delaware", "current": "New York", "page": 2}
+    ]
+    assert qa.contexts and set(qa.contexts) == {_PAGE_TWO_REVISED}
+
+
+def test_revision_endpoint_requires_known_previous(test_client: TestClient) -> None:
+    response = test_client.post(
+        "/extract/revision",
+        files={"file": ("v2.pdf", b"v2", "application/pdf")},
+        data={"previous_sha256": "../../etc/passwd"},
+    )
+    assert response.status_code == 404
+
+
+def test_saved_record_holds_offsets_not_text(tmp_path) -> None:
+    pages = [{"page": 1, "text": _PAGE_ONE}]
+    digest = inference.page_digest(_PAGE_ONE)
+    start = _PAGE_ONE.index("Alpha Corp")
+    outputs = {digest: {"qa|Who?|1": {"answer": "Alpha Corp", "score": 0.8, "start": start, "end": start + 10}}}
+    entities = [{"field": "party_a", "value": "Alpha Corp", "page": 1, "evidence": _PAGE_ONE[:40]}]
+    revisions.save("a" * 64, pages, outputs, entities)
+
+    raw = (tmp_path / "revisions" / f"{'a' * 64}.json").read_text(encoding="utf-8")
+    assert "made by and between" not in raw
+    record = revisions.load("a" * 64)
+    assert record["outputs"][digest]["qa|Who?|1"] == {"score": 0.8, "start": start, "end": start + 10}
+    with inference.recording(prior=record["outputs"]):
+        assert inference.qa(_PAGE_ONE, "Who?")["answer"] == "Alpha Corp"
+
+
+def test_purge_drops_records_past_retention(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("core.config.REVISION_RETENTION_DAYS", 30)
+    revisions.save("b" * 64, [{"page": 1, "text": _PAGE_ONE}], {}, [])
+    assert revisions.purge(now=time.time()) == 0
+    assert revisions.purge(now=time.time() + 31 * 86400) == 1
+    assert revisions.load("b" * 64) is None
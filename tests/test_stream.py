@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+_PAGES = [
+    {
+        "page": 1,
+        "text": "This Agreement dated 3 October 2025 is governed by the laws of England and Wales.",
+    }
+]
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_emits_pages_entities_then_provenance(
+    monkeypatch: pytest.MonkeyPatch, tmp_path, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: _PAGES)
+
+    response = test_client.post("/extract/stream", files={"file": ("a.pdf", b"pdf", "application/pdf")})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_events(response.text)
+
+    assert events[0] == ("pages", {"page_count": 1})
+    assert events[-1][0] == "provenance"
+    assert events[-1][1]["file_sha256"]
+    entities = {data["field"]: data for name, data in events if name == "entity"}
+    assert entities["governing_law"]["value"] == "England and Wales"
+    assert entities["agreement_date"]["value"] == "3 October 2025"
+    assert (tmp_path / "audit.log").exists()
+
+
+def test_stream_rejects_empty_upload(test_client: TestClient) -> None:
+    response = test_client.post("/extract/stream", files={"file": ("a.pdf", b"", "application/pdf")})
+    assert response.status_code == 400
+
+
+def test_stream_reports_stage_failure_as_error_event(
+    monkeypatch: pytest.MonkeyPatch, tmp_path, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: _PAGES)
+
+    def _broken_dates(*_args: object, **_kwargs: object) -> tuple:
+        raise RuntimeError("date stage crashed")
+
+    monkeypatch.setattr("services.qa_extract.extract_dates", _broken_dates)
+    response = test_client.post("/extract/stream", files={"file": ("a.pdf", b"pdf", "application/pdf")})
+    events = _parse_events(response.text)
+
+    names = [name for name, _ in events]
+    assert names[0] == "pages" and names[-1] == "error"
+    assert "provenance" not in names
+    assert ("entity", "governing_law") in {(name, data.get("field")) for name, data in events}
+    record = json.loads((tmp_path / "audit.log").read_text(encoding="utf-8").splitlines()[-1])
+    assert [entry["field"] for entry in record["fields"]] == ["governing_law"]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import workers
+
+
+def _echo_target(pdf_bytes: bytes, file_hash: str) -> dict:
+    if pdf_bytes == b"boom":
+        raise ValueError("bad pdf")
+    if pdf_bytes == b"slow":
+        time.sleep(1.0)
+    if pdf_bytes == b"hang":
+        time.sleep(60)
+    return {"pid": os.getpid(), "file_hash": file_hash}
+
+
+def _threads_target(pdf_bytes: bytes, file_hash: str) -> dict:
+    from core import config
+
+    return {"pool_size": config.MODEL_POOL_SIZE, "torch_threads": config.MODEL_TORCH_THREADS}
+
+
+def _canned_target(pdf_bytes: bytes, file_hash: str) -> dict:
+    text = "Governed by the laws of Texas."
+    return {
+        "pages": [{"page": 1, "text": text}],
+        "extraction": {
+            "parties": [],
+            "governing_law": {"value": "Texas", "page": 1, "span": [24, 29], "confidence": 0.9},
+        },
+        "outputs": {},
+    }
+
+
+def _staged_target(pdf_bytes: bytes, file_hash: str, fields=None, pages=None, prior=None) -> dict:
+    canned = _canned_target(pdf_bytes, file_hash)
+    extraction = {key: value for key, value in canned["extraction"].items() if fields is None or key in fields}
+    return {"pages": pages or canned["pages"], "extraction": extraction, "outputs": {}}
+
+
+def _pool(target, **overrides) -> workers.WorkerPool:
+    options = {"size": 1, "max_documents": 2, "max_rss_mb": 0, "queue_timeout": 5.0}
+    options.update(overrides)
+    pool = workers.WorkerPool(target=target, warm_models=False, **options)
+    pool.start()
+    return pool
+
+
+def test_workers_are_recycled_after_max_documents() -> None:
+    pool = _pool(_echo_target)
+    try:
+        pids = [pool.submit(b"pdf", f"hash-{index}")["pid"] for index in range(3)]
+        assert pids[0] == pids[1] != pids[2]
+        assert os.getpid() not in pids
+        stats = pool.stats()
+        assert stats["documents"] == 3 and stats["recycled"] == 1
+    finally:
+        pool.stop()
+
+
+def test_worker_errors_surface_and_pool_keeps_serving() -> None:
+    pool = _pool(_echo_target, max_documents=10)
+    try:
+        with pytest.raises(workers.WorkerError, match="bad pdf"):
+            pool.submit(b"boom", "hash")
+        assert pool.submit(b"pdf", "hash")["file_hash"] == "hash"
+    finally:
+        pool.stop()
+
+
+def test_busy_pool_raises_after_queue_timeout() -> None:
+    pool = _pool(_echo_target, max_documents=10, queue_timeout=0.1)
+    try:
+        holder = threading.Thread(target=pool.submit, args=(b"slow", "hash"))
+        holder.start()
+        time.sleep(0.2)
+        with pytest.raises(workers.PoolBusyError):
+            pool.submit(b"pdf", "hash")
+        holder.join()
+    finally:
+        pool.stop()
+
+
+def test_extract_endpoint_uses_worker_pool_in_process_mode(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("core.config.EXTRACTION_MODE", "process")
+    pool = _pool(_canned_target)
+    monkeypatch.setattr("services.workers._POOL", pool)
+    try:
+        response = test_client.post("/extract", files={"file": ("a.pdf", b"pdf", "application/pdf")})
+        assert response.status_code == 200
+        entities = response.json()["entities"]
+        assert entities == [
+            {
+                "field": "governing_law",
+                "value": "Texas",
+                "page": 1,
+                "span": [24, 29],
+                "confidence": 0.9,
+            }
+        ]
+        assert test_client.get("/stats").json()["workers"]["documents"] == 1
+    finally:
+        pool.stop()
+
+
+def test_hung_worker_is_killed_and_replaced() -> None:
+    pool = _pool(_echo_target, max_documents=10, job_timeout=3.0)
+    try:
+        first_pid = pool.stats()["pids"][0]
+        with pytest.raises(workers.WorkerError, match="timed out"):
+            pool.submit(b"hang", "hash")
+        result = pool.submit(b"pdf", "hash")
+        assert result["pid"] != first_pid
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        pool.stop()
+
+
+def test_revision_and_stream_use_worker_pool_in_process_mode(
+    monkeypatch: pytest.MonkeyPatch, test_client: TestClient
+) -> None:
+    monkeypatch.setattr("core.config.EXTRACTION_MODE", "process")
+    monkeypatch.setattr("services.pdf_text.extract_pages", lambda _: [{"page": 1, "text": "x"}])
+    pool = _pool(_staged_target, max_documents=10)
+    monkeypatch.setattr("services.workers._POOL", pool)
+    monkeypatch.setattr("core.model.get_qa", lambda: pytest.fail("parent process ran the QA model"))
+    try:
+        first = test_client.post("/extract", files={"file": ("a.pdf", b"v1", "application/pdf")})
+        previous = first.json()["provenance"]["file_sha256"]
+        revised = test_client.post(
+            "/extract/revision",
+            files={"file": ("b.pdf", b"v2", "application/pdf")},
+            data={"previous_sha256": previous},
+        )
+        assert revised.status_code == 200
+        assert revised.json()["entities"][0]["value"] == "Texas"
+
+        streamed = test_client.post("/extract/stream", files={"file": ("c.pdf", b"v3", "application/pdf")})
+        assert '"value": "Texas"' in streamed.text
+        assert "event: provenance" in streamed.text
+        # One job each for /extract and /extract/revision, then one per stream stage.
+        assert pool.stats()["documents"] == 2 + 3
+    finally:
+        pool.stop()
+
+
+def test_workers_split_torch_threads_across_the_pool() -> None:
+    pool = _pool(_threads_target, size=2)
+    try:
+        result = pool.submit(b"pdf", "hash")
+        assert result == {"pool_size": 1, "torch_threads": max(1, (os.cpu_count() or 1) // 2)}
+    finally:
+        pool.stop()